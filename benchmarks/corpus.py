@@ -0,0 +1,179 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Generate a synthetic corpus of FTL files, for benchmarks.
+
+The output only depends on the seed and the other parameters, so that runs
+on different machines or revisions analyze the same content. Run from the
+root of the repository:
+
+    python -m benchmarks.corpus OUTPUT_FOLDER --files 200
+"""
+
+import argparse
+import os
+import random
+
+
+BRANDS = ["Firefox", "Thunderbird", "Mozilla", "Pocket", "Relay"]
+BANNED_WORDS = ["simply", "obviously", "whitelist"]
+WORDS = (
+    "account address allow app bookmark browser cancel change choose close "
+    "connection content cookies data default delete device download edit "
+    "enable error file folder history import learn link manage menu message "
+    "new open page password permission private profile remove save search "
+    "settings share show site start sync tab update website window"
+).split()
+TERMS = ["-brand-short-name", "-brand-full-name", "-vendor-short-name"]
+
+LICENSE = """# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+
+def sentence(rng, min_words=3, max_words=12):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    words[0] = words[0].capitalize()
+    return " ".join(words)
+
+
+def text(rng):
+    """Return a sentence, sometimes including content checked by rules."""
+
+    value = sentence(rng)
+    roll = rng.random()
+    if roll < 0.04:
+        value += " it's ready"
+    elif roll < 0.06:
+        value += " 'quoted'"
+    elif roll < 0.08:
+        value += ' "quoted"'
+    elif roll < 0.10:
+        value += "..."
+    elif roll < 0.13:
+        value += f" {rng.choice(BRANDS)}"
+    elif roll < 0.14:
+        value += f" {rng.choice(BANNED_WORDS)}"
+    elif roll < 0.30:
+        value += f" {{ {rng.choice(TERMS)} }}"
+
+    return value
+
+
+def identifier(rng, index):
+    name = "-".join(rng.choices(WORDS, k=rng.randint(1, 3))) + f"-{index}"
+    roll = rng.random()
+    if roll < 0.02:
+        return name.replace("-", "_")
+    if roll < 0.03:
+        return name.capitalize()
+
+    return name
+
+
+def message(rng, index):
+    """Return a message or term, and its variables."""
+
+    name = identifier(rng, index)
+    kind = rng.random()
+    if kind < 0.30:
+        return f"{name} = {text(rng)}\n", []
+    if kind < 0.45:
+        attributes = "".join(
+            f"    .{attr} = {text(rng)}\n"
+            for attr in rng.sample(["label", "title", "placeholder"], 2)
+        )
+        return f"{name} =\n{attributes}    .accesskey = {rng.choice('abcdefg')}\n", []
+    if kind < 0.60:
+        return (
+            f"{name} =\n"
+            "    { $count ->\n"
+            f"        [one] {text(rng)} {{ $count }}\n"
+            f"       *[other] {text(rng)} {{ $count }}\n"
+            "    }\n"
+        ), ["count"]
+    if kind < 0.70:
+        return (
+            f'{name} = {sentence(rng)} <a data-l10n-name="link">{sentence(rng, 1, 3)}'
+            f"</a> <strong>{sentence(rng, 1, 2)}</strong>\n"
+        ), []
+    if kind < 0.82:
+        return f"{name} = {text(rng)} {{ $name }} {sentence(rng, 1, 4)}\n", ["name"]
+    if kind < 0.90:
+        return f"{name} =\n    {text(rng)}\n    {text(rng)}\n", []
+    if kind < 0.95:
+        return f"-{name} = {rng.choice(BRANDS)} {sentence(rng, 1, 2)}\n", []
+
+    return (
+        f"{name} = {text(rng)}\n"
+        f'    .title = {{ DATETIME($date, month: "long") }} {sentence(rng, 1, 3)}\n'
+    ), ["date"]
+
+
+def generate_file(rng, messages, start=0):
+    """Return the content of a FTL file with the given number of messages.
+
+    Messages and terms are numbered from start, to keep identifiers unique
+    across files.
+    """
+
+    lines = [LICENSE, "\n", f"### {sentence(rng)}\n", "\n"]
+    for i in range(messages):
+        if i % 10 == 0:
+            lines.append(f"## {sentence(rng, 2, 5)}\n\n")
+        content, variables = message(rng, start + i)
+        if variables and rng.random() < 0.7:
+            comment = ", ".join(
+                f"${v} (String) - {sentence(rng, 2, 4)}" for v in variables
+            )
+            lines.append(f"# Variables:\n#   {comment}\n")
+        elif rng.random() < 0.1:
+            lines.append(f"# {sentence(rng)}\n")
+        lines.append(content)
+        lines.append("\n")
+
+    return "".join(lines)
+
+
+def generate_corpus(folder, files=100, messages=40, seed=0):
+    """Write a corpus of FTL files in folder, return statistics about it.
+
+    The number of messages per file varies around the average, so that the
+    corpus includes both small and large files.
+    """
+
+    rng = random.Random(seed)
+    stats = {"files": 0, "messages": 0, "bytes": 0}
+    for i in range(files):
+        subfolder = os.path.join(folder, f"component{i % 7}", f"section{i % 3}")
+        os.makedirs(subfolder, exist_ok=True)
+        count = max(1, int(rng.lognormvariate(0, 0.8) * messages))
+        content = generate_file(rng, count, stats["messages"])
+        with open(os.path.join(subfolder, f"file{i}.ftl"), "w", encoding="utf-8") as f:
+            f.write(content)
+        stats["files"] += 1
+        stats["messages"] += count
+        stats["bytes"] += len(content.encode("utf-8"))
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("folder", help="Folder to store the corpus")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=40, help="Average per file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = generate_corpus(args.folder, args.files, args.messages, args.seed)
+    print(
+        f"Generated {stats['files']} files, {stats['messages']} messages, "
+        f"{stats['bytes']:,} bytes."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure linter throughput and memory usage for each group of rules.
+
+A synthetic corpus is generated (see benchmarks.corpus), then analyzed with
+only one group of rules enabled at a time. Results can be stored as JSON,
+and compared with a previous run. Run from the root of the repository:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from contextlib import redirect_stdout
+
+from src.fluent_linter import linter
+
+from .corpus import BANNED_WORDS, BRANDS, generate_corpus
+
+
+TYPOGRAPHY_RULES = ["TE01", "TE02", "TE03", "TE04", "TE05"]
+SYNTAX_RULES = ["SY01", "SY02", "SY03", "SY04", "SY05", "SY06"]
+
+# Configuration with all optional checks disabled
+BASE_CONFIG = {
+    **{rule: {"enabled": False} for rule in TYPOGRAPHY_RULES},
+    "GC": {"disabled": True},
+    "RC": {"disabled": True},
+}
+
+GROUPS = {
+    "baseline": {},
+    "identifiers": {
+        "ID01": {"enabled": True},
+        "ID02": {"enabled": True, "min_length": 9},
+    },
+    "content": {
+        "CO01": {"enabled": True, "brands": BRANDS},
+        "CO02": {"enabled": True, "words": BANNED_WORDS},
+    },
+    "typography": {rule: {"enabled": True} for rule in TYPOGRAPHY_RULES},
+    "syntax": {rule: {"disabled": True} for rule in SYNTAX_RULES},
+    "comments": {
+        "GC": {"disabled": False},
+        "RC": {"disabled": False},
+        "VC": {"disabled": False},
+    },
+    "placeables": {"PS01": {"disabled": False}},
+    "across_files": {"MI03": {"enabled": True}, "MI04": {"enabled": True}},
+}
+GROUPS["all"] = {
+    rule: rule_config
+    for group in GROUPS.values()
+    for rule, rule_config in group.items()
+}
+
+
+def lint_files(paths, config):
+    errors = 0
+    for _, file_errors in linter.lint_iter(paths, config):
+        errors += len(file_errors)
+
+    return errors
+
+
+def lint_folder(folder):
+    with redirect_stdout(io.StringIO()):
+        return len(linter.lint([folder], None, jobs=1))
+
+
+def measure(function, repeat):
+    """Return the best time over repeat runs, the peak memory and the result."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+
+    # Measure memory in a separate run, since tracing slows it down
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak, result
+
+
+def run_suite(folder, stats, groups, repeat):
+    paths = linter.get_file_list(folder)
+    results = {}
+    for group in groups:
+        if group == "lint":
+            # End to end, including the file list and the default config
+            def function():
+                return lint_folder(folder)
+
+        else:
+            config = {**BASE_CONFIG, **GROUPS[group]}
+
+            def function():
+                return lint_files(paths, config)
+
+        seconds, peak, errors = measure(function, repeat)
+        results[group] = {
+            "seconds": seconds,
+            "files_per_second": stats["files"] / seconds,
+            "messages_per_second": stats["messages"] / seconds,
+            "peak_memory_bytes": peak,
+            "errors": errors,
+        }
+
+    return results
+
+
+def print_results(results, baseline=None):
+    header = (
+        f"{'group':<14}{'files/s':>10}{'messages/s':>12}{'peak MB':>10}{'errors':>8}"
+    )
+    if baseline:
+        header += f"{'vs baseline':>13}"
+    print(header)
+    for group, result in results.items():
+        line = (
+            f"{group:<14}{result['files_per_second']:>10,.0f}"
+            f"{result['messages_per_second']:>12,.0f}"
+            f"{result['peak_memory_bytes'] / 1e6:>10.1f}{result['errors']:>8}"
+        )
+        previous = (baseline or {}).get(group)
+        if previous:
+            change = result["files_per_second"] / previous["files_per_second"] - 1
+            line += f"{change:>+12.1%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=40, help="Average per file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--groups",
+        nargs="+",
+        choices=[*GROUPS, "lint"],
+        default=[*GROUPS, "lint"],
+        help="Groups of rules to measure, lint measures lint() end to end",
+    )
+    parser.add_argument("--output", help="Store results in a JSON file")
+    parser.add_argument("--baseline", help="Compare with results from a JSON file")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        corpus = {k: baseline["corpus"][k] for k in ("files", "messages", "seed")}
+        if corpus != {
+            "files": args.files,
+            "messages": args.messages,
+            "seed": args.seed,
+        }:
+            print(f"Warning: the baseline was measured on a different corpus: {corpus}")
+        baseline = baseline["results"]
+
+    folder = tempfile.mkdtemp()
+    try:
+        stats = generate_corpus(folder, args.files, args.messages, args.seed)
+        print(
+            f"Corpus: {stats['files']} files, {stats['messages']} messages, "
+            f"{stats['bytes']:,} bytes.\n"
+        )
+        results = run_suite(folder, stats, args.groups, args.repeat)
+    finally:
+        shutil.rmtree(folder)
+
+    print_results(results, baseline)
+
+    if args.output:
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": {
+                "files": args.files,
+                "messages": args.messages,
+                "seed": args.seed,
+                "total_messages": stats["messages"],
+                "bytes": stats["bytes"],
+            },
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
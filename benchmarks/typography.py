@@ -0,0 +1,67 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare typography checks using source spans and the serializer.
+
+Run from the root of the repository:
+
+    python -m benchmarks.typography
+"""
+
+import argparse
+import timeit
+
+from fluent.syntax import parse
+
+from src.fluent_linter import linter
+
+
+MESSAGES = [
+    "plain-{i} = Welcome to the application, it’s a test string number {i}",
+    "multiline-{i} =\n    First line of text\n    Second line of text\n",
+    "attributes-{i} = Label\n    .title = Tooltip for “item” {i}\n    .accesskey = L",
+    'markup-{i} = Read the <a data-l10n-name="link">documentation</a> first',
+    "placeable-{i} = You have {{ $count }} items in {{ -brand-short-name }}",
+]
+
+
+def build_content(count):
+    return (
+        "\n".join(MESSAGES[i % len(MESSAGES)].format(i=i) for i in range(count)) + "\n"
+    )
+
+
+def run(content, text_from_spans):
+    resource = parse(content)
+    ftl_linter = linter.Linter(
+        "bench.ftl", "", {}, content, linter.get_offsets_and_lines(content)
+    )
+    ftl_linter.text_from_spans = text_from_spans
+    messages = [node for node in resource.body if type(node).__name__ == "Message"]
+
+    def check():
+        for message in messages:
+            ftl_linter.check_typography(message)
+
+    return check
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = build_content(args.messages)
+    for label, text_from_spans in [("serializer", False), ("spans", True)]:
+        check = run(content, text_from_spans)
+        best = min(timeit.repeat(check, number=1, repeat=args.repeat))
+        print(
+            f"{label:>10}: {best * 1000:8.1f} ms "
+            f"({args.messages / best:,.0f} messages/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import hashlib
+import json
+import os
+import platform
+import tempfile
+import time
+import zlib
+
+from fluent.syntax import ast, parse
+
+from .linter import LintError, compile_config
+
+
+try:
+    from importlib.metadata import version as package_version
+
+    fluent_syntax_version = package_version("fluent.syntax")
+except Exception:
+    fluent_syntax_version = None
+
+# Default maximum size of a cache folder, in bytes
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Minimum time between two evictions in a cache folder, in seconds, and the
+# file recording the last one
+EVICTION_INTERVAL = 15 * 60
+EVICTION_MARKER = ".last-eviction"
+
+# Version of the format used to store parsed files
+PARSE_CACHE_FORMAT = 1
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of the file content."""
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_entry_path(folder, key):
+    """Return the path of the entry for key in a cache folder."""
+
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    # Spread entries in subfolders, to keep folders small
+    return os.path.join(folder, name[:2], name)
+
+
+def write_entry(entry_path, data):
+    """Write an entry atomically, so that concurrent runs never read it partially."""
+
+    folder = os.path.dirname(entry_path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, entry_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            # Already removed, e.g. by the eviction of another run
+            pass
+        raise
+
+
+def touch_entry(entry_path):
+    """Mark an entry as recently used."""
+
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass
+
+
+def evict_entries(folder, max_size, interval=EVICTION_INTERVAL):
+    """Remove the least recently used entries, until folder fits in max_size.
+
+    Listing a large folder is slow, so this is done at most once every
+    interval seconds, by any run using the folder. Temporary files left
+    behind by interrupted runs are removed in the same way, once they're old
+    enough to be evicted.
+    """
+
+    marker_path = os.path.join(folder, EVICTION_MARKER)
+    try:
+        if time.time() - os.stat(marker_path).st_mtime < interval:
+            return
+    except OSError:
+        # Never evicted
+        pass
+    try:
+        with open(marker_path, "a"):
+            pass
+        os.utime(marker_path)
+    except OSError:
+        # Missing or read-only folder
+        return
+
+    entries = []
+    total_size = 0
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in filenames:
+            entry_path = os.path.join(dirpath, filename)
+            if entry_path == marker_path:
+                continue
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+    if total_size <= max_size:
+        return
+
+    entries.sort()
+    for _, size, entry_path in entries:
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            # Already removed by another run
+            pass
+        total_size -= size
+        if total_size <= max_size:
+            break
+
+
+def get_versions(version):
+    """Return the versions results depend on.
+
+    Results depend on the linter, fluent.syntax, and Python, which provides
+    the HTML parser.
+    """
+
+    return [version, fluent_syntax_version, platform.python_version()]
+
+
+def config_digest(config, version):
+    """Return a digest identifying the configuration and linter version."""
+
+    serialized = json.dumps(
+        {"config": config, "version": version}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of lint results.
+
+    Results are stored per file, together with the digest of the file
+    content. Since error messages include paths relative to the current
+    folder, the working directory is part of the cache key, together with
+    the configuration and the versions of the linter, fluent.syntax and
+    Python. If any of them changes, the whole cache is discarded.
+
+    If prune is set, entries for files not used during the run, e.g. deleted
+    or renamed files, are removed when saving. Only set it when all files
+    are analyzed.
+    """
+
+    def __init__(self, path, config, version, prune=False):
+        self.path = path
+        self.key = config_digest(
+            {"config": config, "cwd": os.getcwd()}, get_versions(version)
+        )
+        self.prune = prune
+        self.entries = {}
+        # Keys of the entries used during the run
+        self.used = set()
+        self.modified = False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") == self.key:
+                self.entries = data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            # Missing or unreadable cache, start from scratch
+            pass
+
+    @staticmethod
+    def digest(path):
+        return file_digest(path)
+
+    @staticmethod
+    def entry_key(root_folder, path):
+        return f"{root_folder}\0{path}"
+
+    def get(self, root_folder, path, digest):
+        """Return cached results for the file, or None if not available."""
+
+        key = self.entry_key(root_folder, path)
+        self.used.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == digest:
+            # Errors are stored as lists, all of them share the file path
+            errors, identifiers = entry[1]
+            return [LintError(path, *e[1:6], root_folder) for e in errors], identifiers
+
+        return None
+
+    def set(self, root_folder, path, digest, results):
+        key = self.entry_key(root_folder, path)
+        self.used.add(key)
+        self.entries[key] = [digest, results]
+        self.modified = True
+
+    def save(self):
+        """Write the cache to disk, if it changed."""
+
+        if self.prune and len(self.used) < len(self.entries):
+            self.entries = {
+                key: entry for key, entry in self.entries.items() if key in self.used
+            }
+            self.modified = True
+        if not self.modified:
+            return
+
+        # Write to a temporary file and rename it, so that an interrupted run
+        # never leaves a truncated cache behind.
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": self.key, "files": self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.modified = False
+
+
+class SharedCache:
+    """Cache of lint results in a folder, that several runners can share.
+
+    Each result is stored in its own file, named after the digest of the
+    file content, the configuration and the versions of the linter,
+    fluent.syntax and Python (see get_versions()), so that
+    entries never need to be invalidated, and don't depend on where files
+    are checked out. The path is only part of the key for files listed in
+    exclusions.
+
+    Entries are written to a temporary file and renamed, so that concurrent
+    runs never read partial entries. Reading an entry updates its
+    modification time, and save() removes the least recently used entries
+    when the folder grows over max_size bytes (DEFAULT_MAX_SIZE if None),
+    checking its size at most every EVICTION_INTERVAL seconds.
+    """
+
+    def __init__(self, folder, config, version, max_size=None):
+        self.folder = folder
+        self.max_size = DEFAULT_MAX_SIZE if max_size is None else max_size
+        self.key = config_digest(config, get_versions(version))
+        self.excluded_files = {
+            filename for _, filename in compile_config(config).excluded_files
+        }
+        self.modified = False
+
+    @staticmethod
+    def digest(path):
+        return file_digest(path)
+
+    def entry_path(self, path, digest):
+        key = f"{self.key}\0{digest}"
+        if path in self.excluded_files:
+            key += f"\0{path}"
+
+        return get_entry_path(self.folder, key)
+
+    def get(self, root_folder, path, digest):
+        """Return cached results for the file, or None if not available."""
+
+        entry_path = self.entry_path(path, digest)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                errors, identifiers = json.load(f)
+            results = (
+                [LintError(path, *e[1:6], root_folder) for e in errors],
+                identifiers,
+            )
+        except (OSError, ValueError, TypeError):
+            # Missing, or evicted while reading it
+            return None
+        touch_entry(entry_path)
+
+        return results
+
+    def set(self, root_folder, path, digest, results):
+        try:
+            write_entry(
+                self.entry_path(path, digest), json.dumps(results).encode("utf-8")
+            )
+        except OSError:
+            # Results are still returned, e.g. if the folder is read-only or
+            # the disk is full
+            return
+        self.modified = True
+
+    def save(self):
+        """Remove the least recently used entries, if new ones were added."""
+
+        if not self.modified:
+            return
+
+        evict_entries(self.folder, self.max_size)
+        self.modified = False
+
+
+def node_from_json(value):
+    """Build a Fluent AST from its JSON representation.
+
+    Like fluent.syntax.ast.from_json(), but only creates AST nodes, since
+    entries can be written by other users of a shared folder.
+    """
+
+    if isinstance(value, dict):
+        cls = getattr(ast, value.get("type", ""), None)
+        if not isinstance(cls, type) or not issubclass(cls, ast.BaseNode):
+            raise ValueError(f"Unexpected node type: {value.get('type')!r}")
+        return cls(**{k: node_from_json(v) for k, v in value.items() if k != "type"})
+    if isinstance(value, list):
+        return [node_from_json(v) for v in value]
+
+    return value
+
+
+class ParseCache:
+    """Cache of parsed FTL files in a folder, keyed by their content only.
+
+    Parsing doesn't depend on the configuration, so entries are still valid
+    after changing it, when cached results are not. Resources are stored as
+    compressed JSON, which is faster to load than parsing the file again,
+    and only contains data: entries written by other users of the folder
+    can't run code.
+
+    Entries are written and evicted like in SharedCache, and both can use
+    the same folder.
+    """
+
+    def __init__(self, folder, max_size=None):
+        self.folder = folder
+        self.max_size = DEFAULT_MAX_SIZE if max_size is None else max_size
+        self.key = f"ast\0{fluent_syntax_version}\0{PARSE_CACHE_FORMAT}"
+
+    def parse(self, contents):
+        """Return the parsed resource for contents, from the cache if available."""
+
+        digest = hashlib.sha256(contents.encode("utf-8")).hexdigest()
+        entry_path = get_entry_path(self.folder, f"{self.key}\0{digest}")
+        try:
+            with open(entry_path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+            resource = node_from_json(data)
+        except (OSError, ValueError, TypeError, zlib.error):
+            # Missing, evicted while reading it, or not a valid resource
+            resource = None
+        if isinstance(resource, ast.Resource):
+            touch_entry(entry_path)
+            return resource
+
+        resource = parse(contents)
+        try:
+            data = json.dumps(resource.to_json(), separators=(",", ":"))
+            write_entry(entry_path, zlib.compress(data.encode("utf-8"), 1))
+        except OSError:
+            # The file was still parsed, e.g. if the folder is read-only
+            pass
+
+        return resource
+
+    def save(self):
+        """Remove the least recently used entries."""
+
+        evict_entries(self.folder, self.max_size)
@@ -0,0 +1,406 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+
+from contextlib import redirect_stderr, redirect_stdout
+
+
+def send_request(socket_path, request):
+    """Send a request to the daemon, and return its response."""
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+class MemoryCache:
+    """In-memory cache of lint results.
+
+    Results are stored per file, and invalidated when the modification time
+    or the size of the file changes.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    @staticmethod
+    def digest(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, root_folder, path, digest):
+        """Return cached results for the file, or None if not available."""
+
+        entry = self.entries.get((root_folder, path))
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+
+        return None
+
+    def set(self, root_folder, path, digest, results):
+        self.entries[(root_folder, path)] = (digest, results)
+
+    def save(self):
+        pass
+
+
+class LintSession:
+    """Lint state kept in memory between requests.
+
+    The session stores the compiled configuration, the list of FTL files in
+    each root folder, and the results for each file. The configuration is
+    reloaded when the file changes, the list of files when one of the
+    folders changes.
+    """
+
+    def __init__(self, jobs=None):
+        from . import linter
+
+        self.linter = linter
+        self.jobs = jobs
+        # Configuration path: (file metadata, config, plan)
+        self.configs = {}
+        # Root folder: (modification time of each folder, list of files)
+        self.file_lists = {}
+        # (configuration digest, working directory): MemoryCache
+        self.caches = {}
+
+    def get_config(self, config_path):
+        """Return the configuration and its compiled plan."""
+
+        # Without a path, the configuration shipped with the linter is used,
+        # and stored like any other file.
+        key = os.path.abspath(self.linter.get_config_file(config_path))
+        try:
+            digest = MemoryCache.digest(key)
+        except OSError:
+            # Let load_config() report the missing file
+            digest = key = None
+        cached = self.configs.get(key)
+        if key is None or cached is None or cached[0] != digest:
+            config = self.linter.load_config(config_path)
+            cached = (digest, config, self.linter.compile_config(config))
+            if key is not None:
+                self.configs[key] = cached
+
+        return cached[1], cached[2]
+
+    def get_cache(self, config):
+        """Return the result cache for the configuration.
+
+        Since error messages include paths relative to the current folder,
+        each working directory has its own cache.
+        """
+
+        from .cache import config_digest
+
+        key = (config_digest(config, self.linter.version), os.getcwd())
+        if key not in self.caches:
+            self.caches[key] = MemoryCache()
+
+        return self.caches[key]
+
+    def list_files(self, path):
+        """Get the list of supported files, like get_file_list().
+
+        The list is stored together with the modification time of each
+        folder, which changes when files are added, removed or renamed.
+        """
+
+        cached = self.file_lists.get(path)
+        if cached is not None:
+            folders, file_list = cached
+            try:
+                if all(os.stat(f).st_mtime_ns == m for f, m in folders.items()):
+                    return list(file_list)
+            except OSError:
+                pass
+
+        folders = {}
+        file_list = []
+        self._scan_folder(path, folders, file_list)
+        file_list.sort()
+        self.file_lists[path] = (folders, file_list)
+
+        return list(file_list)
+
+    def _scan_folder(self, folder, folders, file_list):
+        # Read the modification time before listing the folder, so that a
+        # change happening in between invalidates the list on the next run.
+        try:
+            folders[folder] = os.stat(folder).st_mtime_ns
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir():
+                self._scan_folder(entry.path, folders, file_list)
+            elif entry.name.endswith(".ftl"):
+                file_list.append(entry.path)
+
+    @staticmethod
+    def skip_unreadable(files):
+        readable = {}
+        for root_folder, paths in files.items():
+            readable[root_folder] = []
+            for path in paths:
+                if os.access(path, os.R_OK):
+                    readable[root_folder].append(path)
+                else:
+                    print(f"Ignoring {path}: file not readable", file=sys.stderr)
+
+        return readable
+
+    def lint(self, *args, **kwargs):
+        """Same as linter.lint(), using the state stored in the session."""
+
+        results = []
+        for _, errors in self.iter_lint(*args, **kwargs):
+            results.extend(errors)
+
+        return results
+
+    def iter_lint(
+        self,
+        file_paths,
+        config_path,
+        jobs=None,
+        cache_path=None,
+        changed_since=None,
+        changed_messages=False,
+        quiet=False,
+        profiler=None,
+        shard=None,
+        cache_dir=None,
+        cache_size=None,
+        skip_unreadable=False,
+    ):
+        """Same as linter.iter_lint(), using the state stored in the session.
+
+        cache_path, cache_dir and cache_size are ignored, since results are
+        always cached in memory. If skip_unreadable is True, files that can't
+        be read, e.g. while they're being replaced, are ignored with a
+        warning instead of stopping the analysis.
+        """
+
+        files, file_changes, partial = self.linter.get_files(
+            file_paths, changed_since, self.list_files
+        )
+        if skip_unreadable:
+            files = self.skip_unreadable(files)
+        if shard is not None:
+            files = self.linter.get_shard(files, shard)
+            partial = True
+        if not quiet:
+            total_files = sum(len(paths) for paths in files.values())
+            print(f"Files to analyze: {total_files}.")
+
+        config, plan = self.get_config(config_path)
+        cache = None
+        if not changed_messages:
+            file_changes = None
+            cache = self.get_cache(config)
+
+        yield from self.linter.iter_lint_files(
+            files, plan, jobs or self.jobs, cache, file_changes, partial, profiler
+        )
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        response = self.server.handle_command(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class LintServer(socketserver.UnixStreamServer):
+    """Serve lint requests over a Unix socket.
+
+    Each request is a JSON object on a single line, with a command ("lint",
+    "ping" or "stop"). Lint requests include the command line arguments and the
+    working directory of the client. The response is a JSON object with the
+    output of the linter and the exit code.
+
+    Requests are handled one at a time, since the working directory is
+    changed while handling them.
+    """
+
+    def __init__(self, socket_path, jobs=None):
+        self.session = LintSession(jobs)
+        self.running = True
+        super().__init__(socket_path, RequestHandler)
+
+    def server_bind(self):
+        # Only allow the current user to connect
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def handle_command(self, request):
+        command = request.get("command")
+        if command == "lint":
+            return self.run_lint(
+                request.get("argv", []), request.get("cwd"), request.get("stdin")
+            )
+        if command == "ping":
+            return {"output": "", "exit_code": 0}
+        if command == "stop":
+            self.running = False
+            return {"output": "Daemon stopped.\n", "exit_code": 0}
+
+        return {"output": f"Unknown command: {command}\n", "exit_code": 2}
+
+    def run_lint(self, argv, cwd, stdin=None):
+        if "--watch" in argv:
+            return {
+                "output": "--watch is not supported by the daemon\n",
+                "exit_code": 2,
+            }
+
+        output = io.StringIO()
+        initial_cwd = os.getcwd()
+        initial_stdin = sys.stdin
+        # The list of files can be read from the standard input of the client
+        sys.stdin = io.StringIO(stdin or "")
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                if cwd:
+                    os.chdir(cwd)
+                exit_code = self.session.linter.run(
+                    argv, self.session.iter_lint, prog="moz-fluent-lint"
+                )
+        except SystemExit as e:
+            # Raised by the argument parser, e.g. for invalid arguments
+            exit_code = e.code if isinstance(e.code, int) else 2
+        except Exception:
+            traceback.print_exc(file=output)
+            exit_code = 2
+        finally:
+            os.chdir(initial_cwd)
+            sys.stdin = initial_stdin
+
+        return {"output": output.getvalue(), "exit_code": exit_code}
+
+    def serve_until_stopped(self):
+        while self.running:
+            self.handle_request()
+
+
+def serve(socket_path, jobs=None):
+    """Run the daemon until a stop request is received."""
+
+    if os.path.exists(socket_path):
+        try:
+            send_request(socket_path, {"command": "ping"})
+            sys.exit(f"A daemon is already listening on {socket_path}")
+        except OSError:
+            # Stale socket left behind by a previous daemon
+            os.unlink(socket_path)
+
+    server = LintServer(socket_path, jobs)
+    print(f"Listening on {socket_path}.")
+    try:
+        server.serve_until_stopped()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+
+
+def lint(socket_path, argv):
+    """Send a lint request to the daemon, and print its output.
+
+    If the daemon is not running, files are analyzed in this process
+    instead. Return the exit code.
+    """
+
+    request = {"command": "lint", "argv": argv, "cwd": os.getcwd()}
+    if "-" in argv:
+        request["stdin"] = sys.stdin.read()
+    try:
+        response = send_request(socket_path, request)
+    except OSError:
+        print(
+            f"No daemon listening on {socket_path}, running locally.",
+            file=sys.stderr,
+        )
+        from .linter import run
+
+        return run(argv, prog="moz-fluent-lint")
+
+    sys.stdout.write(response["output"])
+
+    return response["exit_code"]
+
+
+def positive_int(value):
+    """Same as linter.positive_int(), imported only when needed."""
+
+    from .linter import positive_int
+
+    return positive_int(value)
+
+
+def main():
+    # The client only relies on the standard library, to keep startup fast.
+    # The linter is imported when starting the daemon.
+    parser = argparse.ArgumentParser(
+        description="Keep the linter running in the background, and send it "
+        "lint requests over a Unix socket"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Start the daemon")
+    serve_parser.add_argument("socket", help="Path to the Unix socket")
+    serve_parser.add_argument(
+        "--jobs",
+        "-j",
+        help="Number of files to analyze in parallel",
+        type=positive_int,
+    )
+
+    stop_parser = subparsers.add_parser("stop", help="Stop the daemon")
+    stop_parser.add_argument("socket", help="Path to the Unix socket")
+
+    lint_parser = subparsers.add_parser(
+        "lint", help="Lint files, with the same arguments as moz-fluent-lint"
+    )
+    lint_parser.add_argument("socket", help="Path to the Unix socket")
+    lint_parser.add_argument(
+        "args", help="Arguments for moz-fluent-lint", nargs=argparse.REMAINDER
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.jobs)
+    elif args.command == "stop":
+        try:
+            response = send_request(args.socket, {"command": "stop"})
+        except OSError:
+            sys.exit(f"No daemon listening on {args.socket}")
+        sys.stdout.write(response["output"])
+    else:
+        sys.exit(lint(args.socket, args.args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+
+from urllib.parse import quote
+from xml.sax.saxutils import quoteattr
+
+
+class Formatter:
+    """Write errors to a stream, one file at a time.
+
+    Output is flushed after each file, so that errors are available as soon
+    as files are analyzed. shard is the (index, count) tuple of the shard
+    analyzed with --shard, if any.
+    """
+
+    def __init__(self, stream, version="--", shard=None):
+        self.stream = stream
+        self.version = version
+        self.shard = shard
+
+    def start(self):
+        pass
+
+    def add_file(self, path, errors):
+        pass
+
+    def end(self):
+        pass
+
+    def write(self, text):
+        self.stream.write(text)
+
+
+class JsonLinesFormatter(Formatter):
+    """One JSON object per error and line.
+
+    Results of a shard end with a record like {"shard": "K/N", "files": n,
+    "complete": true}, so that merging them can check that all shards are
+    present and complete.
+    """
+
+    def start(self):
+        self.files = 0
+
+    def add_file(self, path, errors):
+        self.files += 1
+        file_path = os.path.relpath(path)
+        for e in errors:
+            error = {
+                "path": file_path,
+                "message_id": e.message_id,
+                "rule": e.rule,
+                "line": e.line,
+                "column": e.col,
+                "message": e.msg,
+            }
+            self.write(json.dumps(error, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def end(self):
+        if self.shard is not None:
+            index, count = self.shard
+            record = {
+                "shard": f"{index}/{count}",
+                "files": self.files,
+                "complete": True,
+            }
+            self.write(json.dumps(record) + "\n")
+            self.stream.flush()
+
+
+class SarifFormatter(Formatter):
+    """SARIF 2.1.0 log, with a single run.
+
+    The list of results is written as files are analyzed, rules are listed
+    at the end, once all of them are known.
+    """
+
+    def start(self):
+        self.rules = []
+        self.separator = ""
+        self.write(
+            '{"version": "2.1.0", "$schema": '
+            '"https://json.schemastore.org/sarif-2.1.0.json", "runs": [{'
+            '"columnKind": "unicodeCodePoints", "results": ['
+        )
+
+    def add_file(self, path, errors):
+        uri = quote(os.path.relpath(path).replace(os.sep, "/"))
+        for e in errors:
+            if e.rule not in self.rules:
+                self.rules.append(e.rule)
+            location = {"physicalLocation": {"artifactLocation": {"uri": uri}}}
+            if e.line is not None:
+                location["physicalLocation"]["region"] = {
+                    "startLine": e.line,
+                    "startColumn": e.col,
+                }
+            if e.message_id is not None:
+                location["logicalLocations"] = [{"name": e.message_id}]
+            result = {
+                "ruleId": e.rule,
+                "level": "error",
+                "message": {"text": e.msg},
+                "locations": [location],
+            }
+            self.write(self.separator + json.dumps(result, ensure_ascii=False))
+            self.separator = ", "
+        self.stream.flush()
+
+    def end(self):
+        driver = {
+            "name": "moz-fluent-linter",
+            "version": self.version,
+            "informationUri": "https://github.com/mozilla-l10n/moz-fluent-linter",
+            "rules": [{"id": rule} for rule in self.rules],
+        }
+        self.write(f'], "tool": {{"driver": {json.dumps(driver)}}}}}]}}\n')
+
+
+class CheckstyleFormatter(Formatter):
+    """Checkstyle XML report, with an element for each analyzed file."""
+
+    def start(self):
+        self.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<checkstyle version="4.3">\n'
+        )
+
+    def add_file(self, path, errors):
+        self.write(f"<file name={quoteattr(os.path.relpath(path))}>\n")
+        for e in errors:
+            attributes = "" if e.line is None else f'line="{e.line}" column="{e.col}" '
+            self.write(
+                f'  <error {attributes}severity="error" message={quoteattr(e.msg)} '
+                f'source="moz-fluent-linter.{e.rule}"/>\n'
+            )
+        self.write("</file>\n")
+        self.stream.flush()
+
+    def end(self):
+        self.write("</checkstyle>\n")
+
+
+formatters = {
+    "jsonl": JsonLinesFormatter,
+    "sarif": SarifFormatter,
+    "checkstyle": CheckstyleFormatter,
+}
@@ -7,11 +7,22 @@
 
 import argparse
 import bisect
+import collections
+import functools
+import heapq
+import html
+import itertools
+import mmap
 import os
 import re
+import subprocess
 import sys
+import time
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from html.parser import HTMLParser
+from typing import NamedTuple
 
 import yaml
 
@@ -39,6 +50,301 @@ class MLStripper(HTMLParser):
         return " ".join(self.fed)
 
 
+backreference_re = re.compile(r"\\[1-9]|\(\?P=")
+
+
+# Simple start and end tags, without comments or processing instructions
+simple_tag_re = re.compile(
+    r"""</([a-zA-Z][a-zA-Z0-9-]*)\s*>"""
+    r"""|<([a-zA-Z][a-zA-Z0-9-]*)"""
+    r"""(?:\s+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*"""
+    r"""\s*/?>"""
+)
+# Elements whose content is not parsed as markup by HTMLParser
+cdata_elements = {
+    "iframe",
+    "noembed",
+    "noframes",
+    "noscript",
+    "plaintext",
+    "script",
+    "style",
+    "textarea",
+    "title",
+    "xmp",
+}
+
+
+def strip_markup_slow(text):
+    html_stripper = MLStripper()
+    html_stripper.feed(text)
+
+    return html_stripper.get_data()
+
+
+def strip_markup(text):
+    """Remove HTML markup from text, converting character references.
+
+    The output is the same as MLStripper, which is only used for text that
+    can't be handled here: comments, CDATA elements, malformed tags, and
+    character references at the end of the text.
+    """
+
+    if "<" not in text:
+        if "&" not in text:
+            # Plain text, nothing to strip
+            return text
+        return strip_markup_slow(text)
+
+    chunks = []
+    pos = 0
+    while True:
+        tag_start = text.find("<", pos)
+        if tag_start < 0:
+            break
+        if pos < tag_start:
+            chunks.append(html.unescape(text[pos:tag_start]))
+        match = simple_tag_re.match(text, tag_start)
+        if (
+            match is None
+            or (match.group(1) or match.group(2)).lower() in cdata_elements
+        ):
+            return strip_markup_slow(text)
+        pos = match.end()
+
+    # HTMLParser holds back trailing text if it might include an incomplete
+    # character reference.
+    if pos < len(text):
+        if "&" in text[pos:]:
+            return strip_markup_slow(text)
+        chunks.append(text[pos:])
+
+    return " ".join(chunks)
+
+
+# Text elements are short and often repeated (e.g. the same label in several
+# messages), unlike the text of whole messages.
+strip_text_element = functools.lru_cache(maxsize=4096)(strip_markup)
+
+
+# Header of a hunk in the output of git diff, with the start and length of the
+# range of lines in the new version of the file.
+hunk_header_re = re.compile(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Rules checking the structure of the file, reported even when only errors in
+# changed messages are requested.
+file_level_rules = {
+    "GC01",
+    "GC02",
+    "GC03",
+    "GC04",
+    "JUNK",
+    "MI01",
+    "MI02",
+    "RC01",
+    "RC02",
+    "RC03",
+}
+
+
+class PatternSet:
+    """A set of regular expressions, searched in a single pass.
+
+    All patterns are combined in one alternation, so text that doesn't match
+    any of them (the most common case) is scanned only once. When the combined
+    expression matches, patterns are checked individually to report all the
+    matching ones, including overlapping matches.
+    """
+
+    def __init__(self, names, patterns):
+        self.names = names
+        self.patterns = [re.compile(p) for p in patterns]
+        # Backreferences would point to the wrong group once patterns are
+        # combined, and global flags are only allowed at the start of an
+        # expression. In those cases, fall back to checking each pattern.
+        self.combined = None
+        if not any(backreference_re.search(p) for p in patterns):
+            try:
+                self.combined = re.compile("|".join(f"(?:{p})" for p in patterns))
+            except re.error:
+                pass
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def findall(self, text):
+        """Return the names of all patterns matching text."""
+
+        if not self.patterns:
+            return []
+        if self.combined is not None and not self.combined.search(text):
+            return []
+
+        return [
+            name
+            for name, pattern in zip(self.names, self.patterns)
+            if pattern.search(text)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_brand_matcher(brands):
+    """Build a PatternSet for a tuple of brand names.
+
+    Brand names that don't contain special characters are matched as whole
+    words, the others are used as regular expressions.
+    """
+
+    patterns = []
+    for brand in brands:
+        if brand == re.escape(brand):
+            patterns.append(r"\b" + brand + r"\b")
+        else:
+            patterns.append(brand)
+
+    return PatternSet(brands, patterns)
+
+
+@functools.lru_cache(maxsize=None)
+def get_banned_words_matcher(words):
+    """Build a PatternSet for a tuple of lowercase banned words."""
+
+    return PatternSet(words, [r"\b" + word + r"\b" for word in words])
+
+
+class RulePlan(NamedTuple):
+    """Configuration compiled for the linter, see compile_config()."""
+
+    # ID checks
+    id01: bool
+    id02: bool
+    id02_min_length: int
+    # Content checks
+    brand_matcher: PatternSet
+    banned_words_matcher: PatternSet
+    # Typography checks
+    te01: bool
+    te02: bool
+    te03: bool
+    te04: bool
+    te05: bool
+    # Syntax features that are disabled
+    sy01_disabled: bool
+    sy02_disabled: bool
+    sy03_disabled: bool
+    sy04_disabled: bool
+    sy05_disabled: bool
+    sy06_disabled: bool
+    # Comments and placeables checks
+    gc: bool
+    rc: bool
+    vc: bool
+    ps01: bool
+    # Checks across files
+    mi03: bool
+    mi04: bool
+    # Exclusions, as sets of (rule, message ID) and (rule, file name)
+    excluded_messages: frozenset
+    excluded_files: frozenset
+    # If any typography check (including brand names) is enabled
+    typography: bool
+    # If any check needs to visit the content of patterns
+    walk_patterns: bool
+
+
+def compile_config(config):
+    """Compile the configuration into an immutable RulePlan.
+
+    This should be called once per run, so that the linter doesn't need to
+    look up raw config values, or scan exclusion lists, for each node.
+    """
+
+    if isinstance(config, RulePlan):
+        return config
+
+    def enabled(rule, default=False):
+        return bool((config.get(rule) or {}).get("enabled", default))
+
+    def disabled(rule):
+        return bool((config.get(rule) or {}).get("disabled", False))
+
+    brands = config["CO01"].get("brands", []) if enabled("CO01") else []
+    # Banned words are checked case insensitive
+    words = (
+        [word.lower() for word in config["CO02"].get("words", [])]
+        if enabled("CO02")
+        else []
+    )
+
+    excluded_messages = set()
+    excluded_files = set()
+    for rule, rule_config in config.items():
+        if not isinstance(rule_config, dict):
+            continue
+        rule_exclusions = rule_config.get("exclusions") or {}
+        for message_id in rule_exclusions.get("messages") or []:
+            excluded_messages.add((rule, message_id))
+        for filename in rule_exclusions.get("files") or []:
+            excluded_files.add((rule, filename))
+
+    plan = dict(
+        id01=enabled("ID01"),
+        id02=enabled("ID02"),
+        id02_min_length=config["ID02"]["min_length"] if enabled("ID02") else 0,
+        brand_matcher=get_brand_matcher(tuple(brands)),
+        banned_words_matcher=get_banned_words_matcher(tuple(words)),
+        te01=enabled("TE01", True),
+        te02=enabled("TE02", True),
+        te03=enabled("TE03", True),
+        te04=enabled("TE04", True),
+        te05=enabled("TE05", True),
+        sy01_disabled=disabled("SY01"),
+        sy02_disabled=disabled("SY02"),
+        sy03_disabled=disabled("SY03"),
+        sy04_disabled=disabled("SY04"),
+        sy05_disabled=disabled("SY05"),
+        sy06_disabled=disabled("SY06"),
+        gc=not disabled("GC"),
+        rc=not disabled("RC"),
+        # Variable comments and placeables checks need to be explicitly enabled
+        vc="VC" in config and not disabled("VC"),
+        ps01="PS01" in config and not disabled("PS01"),
+        mi03=enabled("MI03"),
+        mi04=enabled("MI04"),
+        excluded_messages=frozenset(excluded_messages),
+        excluded_files=frozenset(excluded_files),
+    )
+    plan["typography"] = bool(plan["brand_matcher"]) or any(
+        plan[rule] for rule in ["te01", "te02", "te03", "te04", "te05"]
+    )
+    plan["walk_patterns"] = bool(plan["banned_words_matcher"]) or any(
+        plan[rule]
+        for rule in [
+            # Placeables and references to variables
+            "ps01",
+            "vc",
+            # Term references
+            "mi04",
+            # Syntax features used in patterns
+            "sy02_disabled",
+            "sy03_disabled",
+            "sy04_disabled",
+            "sy06_disabled",
+        ]
+    )
+
+    return RulePlan(**plan)
+
+
+def is_excluded(plan, rule, message_id, filename=None):
+    """Check if message with ID, or file, is excluded for the rule"""
+
+    if (rule, filename) in plan.excluded_files:
+        return True
+
+    return (rule, message_id) in plan.excluded_messages
+
+
 class Linter(visitor.Visitor):
     """Fluent linter implementation.
 
@@ -51,44 +357,49 @@ class Linter(visitor.Visitor):
     https://www.projectfluent.org/python-fluent/fluent.syntax/stable/usage.html
     """
 
-    def __init__(self, path, root_folder, config, contents, offsets_and_lines):
+    # Regular expressions are compiled once, and shared by all instances
+    identifier_re = re.compile(r"[a-z0-9-]+")
+    apostrophe_re = re.compile(r"\w'")
+    incorrect_apostrophe_re = re.compile(r"\w\u2018\w")
+    single_quote_re = re.compile(r"'(.+)'")
+    double_quote_re = re.compile(r"\".+\"")
+    ellipsis_re = re.compile(r"\.\.\.")
+
+    # Syntax to ignore when checking double quotes
+    ftl_syntax_re = [
+        # Parameterized terms
+        re.compile(
+            r'(?<!\{)\{\s*(?:-[A-Za-z0-9._-]+)(?:[\[(]?[A-Za-z0-9_\-, :"]+[\])])*\s*\}'
+        ),
+        # DATETIME() and NUMBER() function
+        re.compile(r"{\s*(?:DATETIME|NUMBER)(.*)\s*}"),
+        # Special characters and empty string
+        re.compile(r'{\s*"(?:[\s{}]{0,1})"\s*}'),
+    ]
+
+    def __init__(self, path, root_folder, config, contents, offsets_and_lines=None):
         super().__init__()
         self.path = path
         self.root_folder = root_folder
-        self.config = config
+        self.plan = compile_config(config)
         self.contents = contents
-        self.offsets_and_lines = offsets_and_lines
-
-        self.results = []
-        self.identifier_re = re.compile(r"[a-z0-9-]+")
-        self.apostrophe_re = re.compile(r"\w'")
-        self.incorrect_apostrophe_re = re.compile(r"\w\u2018\w")
-        self.single_quote_re = re.compile(r"'(.+)'")
-        self.double_quote_re = re.compile(r"\".+\"")
-        self.ellipsis_re = re.compile(r"\.\.\.")
-
-        if "CO01" in config and config["CO01"]["enabled"]:
-            self.brand_names = config["CO01"].get("brands", [])
-        else:
-            self.brand_names = []
-        if "CO02" in config and config["CO02"]["enabled"]:
-            # Transform lowercase
-            self.banned_words = [word.lower() for word in config["CO02"]["words"]]
-        else:
-            self.banned_words = []
-
-        # Syntax to ignore when checking double quotes
-        self.ftl_syntax_re = [
-            # Parameterized terms
-            re.compile(
-                r'(?<!\{)\{\s*(?:-[A-Za-z0-9._-]+)(?:[\[(]?[A-Za-z0-9_\-, :"]+[\])])*\s*\}'
-            ),
-            # DATETIME() and NUMBER() function
-            re.compile(r"{\s*(?:DATETIME|NUMBER)(.*)\s*}"),
-            # Special characters and empty string
-            re.compile(r'{\s*"(?:[\s{}]{0,1})"\s*}'),
-        ]
-        self.ids = []
+        # Offsets of new lines, as returned by get_line_offsets(), or by
+        # get_offsets_and_lines(). If not provided, they're computed when the
+        # first position is needed.
+        if offsets_and_lines and isinstance(offsets_and_lines[0], tuple):
+            offsets_and_lines = array("l", [o for o, _ in offsets_and_lines])
+        self._line_offsets = offsets_and_lines
+
+        self.errors = []
+        self.brand_matcher = self.plan.brand_matcher
+        self.banned_words_matcher = self.plan.banned_words_matcher
+
+        # Span of the first definition for each message identifier
+        self.ids = {}
+        # Span of the first definition for each term identifier
+        self.term_ids = {}
+        # Name and span of term references
+        self.term_references = []
         self.state = {
             # The resource comment should be at the top of the page after the license.
             "node_can_be_resource_comment": True,
@@ -105,6 +416,16 @@ class Linter(visitor.Visitor):
             "variables": [],
         }
 
+        # Set of line numbers changed in the file. If set, errors within messages
+        # and terms are only reported if they include at least one of these lines.
+        self.changed_lines = None
+        # If errors for the current message or term should be reported
+        self.report_entry = True
+
+        # Set this to false to always serialize messages for typography checks,
+        # instead of using the original content.
+        self.text_from_spans = True
+
         # Set this to true to debug print the root node's json. This is useful for
         # writing new lint rules, or debugging existing ones.
         self.debug_print_json = False
@@ -112,19 +433,24 @@ class Linter(visitor.Visitor):
     def exclude_message(self, rule, message_id, filename=None):
         """Check if message with ID should be ignored"""
 
-        # Rule is not set in config or doesn't have exclusions
-        if rule not in self.config or "exclusions" not in self.config[rule]:
-            return False
+        return is_excluded(self.plan, rule, message_id, filename)
 
-        rule_exclusions = self.config[rule]["exclusions"]
-        if filename in rule_exclusions.get("files", []):
-            return True
-        if message_id in rule_exclusions.get("messages", []):
-            return True
+    def get_message_text(self, node):
+        """Return the text of a message, without comments.
 
-        return False
+        If possible, the text is sliced from the original content using the
+        node spans. Messages including placeables are serialized instead,
+        since the serializer normalizes them (e.g. `{$var}` becomes
+        `{ $var }`), and brand names can rely on that. Other differences
+        between the two (spaces around `=`, indentation) don't affect the
+        typography checks.
+        """
+
+        if self.text_from_spans and node.span is not None:
+            text = self.contents[node.id.span.start : node.span.end]
+            if "{" not in text:
+                return text + "\n"
 
-    def check_typography(self, node):
         # Serialize message without comments
         parts = []
         parts.append(f"{node.id.name} =")
@@ -135,10 +461,12 @@ class Linter(visitor.Visitor):
                 parts.append(serializer.serialize_attribute(attribute))
         parts.append("\n")
 
-        # Analyze message for issues with quotes, after removing HTML markup
-        html_stripper = MLStripper()
-        html_stripper.feed("".join(parts))
-        cleaned_str = html_stripper.get_data()
+        return "".join(parts)
+
+    def check_typography(self, node):
+        # Analyze message for issues with quotes, after removing HTML markup.
+        # The text is stripped once, and shared by all checks below.
+        cleaned_str = strip_markup(self.get_message_text(node))
 
         message_id = node.id.name
 
@@ -147,14 +475,7 @@ class Linter(visitor.Visitor):
         if message_id is not None and not self.exclude_message(
             "CO01", message_id, self.path
         ):
-            found_brands = []
-            for brand in self.brand_names:
-                if brand == re.escape(brand):
-                    brand_re = re.compile(r"\b" + brand + r"\b")
-                else:
-                    brand_re = re.compile(brand)
-                if brand_re.search(cleaned_str):
-                    found_brands.append(brand)
+            found_brands = self.brand_matcher.findall(cleaned_str)
             if found_brands:
                 self.add_error(
                     node,
@@ -165,7 +486,7 @@ class Linter(visitor.Visitor):
                 )
 
         if (
-            self.config.get("TE01", {}).get("enabled", True)
+            self.plan.te01
             and self.apostrophe_re.search(cleaned_str)
             and not self.exclude_message("TE01", message_id)
         ):
@@ -176,7 +497,7 @@ class Linter(visitor.Visitor):
                 "Strings with apostrophes should use foo\u2019s instead of foo's.",
             )
         if (
-            self.config.get("TE02", {}).get("enabled", True)
+            self.plan.te02
             and self.incorrect_apostrophe_re.search(cleaned_str)
             and not self.exclude_message("TE02", message_id)
         ):
@@ -187,7 +508,7 @@ class Linter(visitor.Visitor):
                 "Strings with apostrophes should use foo\u2019s instead of foo\u2018s.",
             )
         if (
-            self.config.get("TE03", {}).get("enabled", True)
+            self.plan.te03
             and self.single_quote_re.search(cleaned_str)
             and not self.exclude_message("TE03", message_id)
         ):
@@ -197,9 +518,7 @@ class Linter(visitor.Visitor):
                 "TE03",
                 "Single-quoted strings should use Unicode \u2018foo\u2019 instead of 'foo'.",
             )
-        if self.config.get("TE04", {}).get(
-            "enabled", True
-        ) and self.double_quote_re.search(cleaned_str):
+        if self.plan.te04 and self.double_quote_re.search(cleaned_str):
             # Ignore parameterized terms and other functions
             for regex in self.ftl_syntax_re:
                 cleaned_str = regex.sub("", cleaned_str)
@@ -214,7 +533,7 @@ class Linter(visitor.Visitor):
                     'Double-quoted strings should use Unicode \u201cfoo\u201d instead of "foo".',
                 )
         if (
-            self.config.get("TE05", {}).get("enabled", True)
+            self.plan.te05
             and self.ellipsis_re.search(cleaned_str)
             and not self.exclude_message("TE05", message_id)
         ):
@@ -250,7 +569,7 @@ class Linter(visitor.Visitor):
 
     def visit_Attribute(self, node):
         # Log errors if attributes are not supported
-        if "SY05" in self.config and self.config["SY05"]["disabled"]:
+        if self.plan.sy05_disabled:
             self.add_error(node, None, "SY05", "Attributes are not supported.")
             pass
         else:
@@ -263,6 +582,34 @@ class Linter(visitor.Visitor):
         # Store the comment
         self.state["comment"] = node.content
 
+    def is_changed(self, node):
+        """Check if the node includes at least one changed line."""
+
+        if self.changed_lines is None:
+            return True
+
+        start_line = self.span_to_line_and_col(node.span)[1]
+        end_line = self.span_to_line_and_col(ast.Span(node.span.end, node.span.end))[1]
+
+        return any(
+            line in self.changed_lines for line in range(start_line, end_line + 1)
+        )
+
+    def visit_entry(self, node):
+        """Visit the children of a message or term.
+
+        Patterns are only visited if an enabled check needs their content.
+        """
+
+        if self.plan.walk_patterns:
+            super().generic_visit(node)
+            return
+
+        self.visit(node.id)
+        if self.plan.sy05_disabled:
+            self.visit(node.attributes)
+        self.visit(node.comment)
+
     def visit_FunctionReference(self, node):
         # We don't recurse into function references, the identifiers there are
         # allowed to be free form.
@@ -275,7 +622,7 @@ class Linter(visitor.Visitor):
         self.state["group_comment"] = node.content
 
         # Skip if checks for group comments are disabled
-        if "GC" in self.config and self.config["GC"]["disabled"]:
+        if not self.plan.gc:
             return
 
         if not self.state["can_have_group_comment"]:
@@ -332,8 +679,7 @@ class Linter(visitor.Visitor):
     def visit_Identifier(self, node):
         message_id = f"-{node.name}" if self.state["is_term"] else node.name
         if (
-            "ID01" in self.config
-            and self.config["ID01"]["enabled"]
+            self.plan.id01
             and not self.exclude_message("ID01", node.name, self.path)
             and not self.identifier_re.fullmatch(node.name)
         ):
@@ -345,16 +691,15 @@ class Linter(visitor.Visitor):
             )
 
         if (
-            "ID02" in self.config
-            and self.config["ID02"]["enabled"]
+            self.plan.id02
             and not self.exclude_message("ID02", node.name, self.path)
-            and len(node.name) < self.config["ID02"]["min_length"]
+            and len(node.name) < self.plan.id02_min_length
         ):
             self.add_error(
                 node,
                 message_id,
                 "ID02",
-                f"Identifiers must be at least {self.config['ID02']['min_length']} characters long",
+                f"Identifiers must be at least {self.plan.id02_min_length} characters long",
             )
 
     def visit_Junk(self, node):
@@ -367,27 +712,32 @@ class Linter(visitor.Visitor):
         )
 
     def visit_Message(self, node):
+        self.report_entry = self.is_changed(node)
         self.state["is_term"] = False
         # There must be at least one message or term between group comments.
         self.state["can_have_group_comment"] = True
         self.last_message_id = node.id.name
+        self.state["node_can_be_resource_comment"] = False
 
         # Check for duplicates
         if node.id.name in self.ids:
+            (col, line) = self.span_to_line_and_col(self.ids[node.id.name])
             self.add_error(
                 node,
                 node.id.name,
                 "MI01",
-                f"Identifier {node.id.name} is present more than once in the file.",
+                f"Identifier {node.id.name} is present more than once in the file "
+                f"(first defined at line {line} column {col}).",
             )
         else:
-            self.ids.append(node.id.name)
+            self.ids[node.id.name] = node.span
 
         # Check typography
-        self.check_typography(node)
-        super().generic_visit(node)
+        if self.plan.typography:
+            self.check_typography(node)
+        self.visit_entry(node)
 
-        if "VC" in self.config and not self.config["VC"]["disabled"]:
+        if self.plan.vc:
             # Check if variables are referenced in comments
             if self.state["variables"]:
                 comments = self.state["comment"] + self.state["group_comment"]
@@ -409,21 +759,18 @@ class Linter(visitor.Visitor):
         # Reset comment and variable references after reading the message
         self.state["comment"] = ""
         self.state["variables"] = []
+        self.report_entry = True
 
     def visit_MessageReference(self, node):
         # Log errors if message references are not supported
-        if "SY02" in self.config and self.config["SY02"]["disabled"]:
+        if self.plan.sy02_disabled:
             self.add_error(node, None, "SY02", "Message references are not supported.")
 
         # We don't recurse into message references, the identifiers are either
         # checked elsewhere or are attributes and come from DOM.
 
     def visit_Placeable(self, node):
-        if (
-            "PS01" in self.config
-            and not self.config["PS01"]["disabled"]
-            and type(node.expression) not in [ast.SelectExpression]
-        ):
+        if self.plan.ps01 and type(node.expression) not in [ast.SelectExpression]:
             if isinstance(node.expression, ast.VariableReference):
                 placeable_name = f"${node.expression.id.name}"
             elif isinstance(node.expression, ast.TermReference):
@@ -451,7 +798,7 @@ class Linter(visitor.Visitor):
         # This node is a comment with: "###"
 
         # Skip if checks for group comments are disabled
-        if "RC" in self.config and self.config["RC"]["disabled"]:
+        if not self.plan.rc:
             return
 
         if not self.state["node_can_be_resource_comment"]:
@@ -492,7 +839,7 @@ class Linter(visitor.Visitor):
 
     def visit_SelectExpression(self, node):
         # Log errors if variants are not supported
-        if node.variants and "SY04" in self.config and self.config["SY04"]["disabled"]:
+        if node.variants and self.plan.sy04_disabled:
             self.add_error(node, None, "SY04", "Variants are not supported.")
             pass
         else:
@@ -510,41 +857,47 @@ class Linter(visitor.Visitor):
             self.state["variables"].append(node.selector.id.name)
 
     def visit_Term(self, node):
+        self.report_entry = self.is_changed(node)
         self.state["is_term"] = True
         # There must be at least one message or term between group comments.
         self.state["can_have_group_comment"] = True
         self.last_message_id = None
+        self.state["node_can_be_resource_comment"] = False
+        if node.id.name not in self.term_ids:
+            self.term_ids[node.id.name] = node.span
 
         # Log errors if terms are not supported
-        if "SY01" in self.config and self.config["SY01"]["disabled"]:
+        if self.plan.sy01_disabled:
             self.add_error(node, node.id, "SY01", "Terms are not supported.")
 
-        super().generic_visit(node)
+        self.visit_entry(node)
+        self.report_entry = True
 
     def visit_TermReference(self, node):
         # Log errors if term references are not supported
-        if "SY03" in self.config and self.config["SY03"]["disabled"]:
+        if self.plan.sy03_disabled:
             self.add_error(node, None, "SY03", "Terms are not supported.")
 
+        self.term_references.append((node.id.name, node.span))
+
         # Reset comment and variable references after reading the message
         self.state["comment"] = ""
         self.state["variables"] = []
 
     def visit_TextElement(self, node):
-        html_stripper = MLStripper()
-        html_stripper.feed(node.value)
-        cleaned_str = html_stripper.get_data()
+        if not self.banned_words_matcher:
+            return
+
+        # Banned words are checked in each element: the text of the whole
+        # message also includes identifiers and placeables.
+        cleaned_str = strip_text_element(node.value)
 
         # If part of a message, check for banned words
         message_id = self.last_message_id
         if message_id is not None and not self.exclude_message(
             "CO02", message_id, self.path
         ):
-            found_banned_words = []
-            for word in self.banned_words:
-                bannedword_re = re.compile(r"\b" + word + r"\b")
-                if bannedword_re.search(cleaned_str.lower()):
-                    found_banned_words.append(word)
+            found_banned_words = self.banned_words_matcher.findall(cleaned_str.lower())
             if found_banned_words:
                 self.add_error(
                     node,
@@ -562,50 +915,149 @@ class Linter(visitor.Visitor):
             self.state["variables"].append(node.id.name)
 
         # Log errors if variable references are not supported
-        if "SY06" in self.config and self.config["SY06"]["disabled"]:
+        if self.plan.sy06_disabled:
             self.add_error(node, None, "SY06", "Variable references are not supported.")
 
     def add_error(self, node, message_id, rule, msg):
+        if not self.report_entry and rule not in file_level_rules:
+            return
+
         (col, line) = self.span_to_line_and_col(node.span)
+        self.errors.append(
+            LintError(self.path, message_id, rule, line, col, msg, self.root_folder)
+        )
 
-        file_path = os.path.relpath(self.path)
-        message_id = message_id if message_id is not None else "-"
-        error_msg = f"""
-            File path: {file_path}
-            Message ID: {message_id}
-            Position: line {line} column {col}
-            Error ({rule}): {msg}"""
+    @property
+    def results(self):
+        """Errors found in the file, formatted for output."""
+
+        return list(format_errors(self.errors))
+
+    def get_identifiers(self):
+        """Return identifiers defined and referenced in the file.
+
+        Message and term definitions are returned as lists of (name, line,
+        col), term names include the leading dash. Term references are
+        returned in the same format.
+        """
+
+        def positions(items, prefix=""):
+            result = []
+            for name, span in items:
+                (col, line) = self.span_to_line_and_col(span)
+                result.append((prefix + name, line, col))
+            return result
 
-        self.results.append(error_msg)
+        return {
+            "messages": positions(self.ids.items()),
+            "terms": positions(self.term_ids.items(), "-"),
+            "term_references": positions(self.term_references, "-"),
+        }
+
+    @property
+    def line_offsets(self):
+        if self._line_offsets is None:
+            self._line_offsets = get_line_offsets(self.contents)
+
+        return self._line_offsets
 
     def span_to_line_and_col(self, span):
-        i = bisect.bisect_left(self.offsets_and_lines, (span.start, 0))
+        # Number of new lines before the span, the line is the next one
+        i = bisect.bisect_left(self.line_offsets, span.start)
         if i > 0:
-            col = span.start - self.offsets_and_lines[i - 1][0]
+            col = span.start - self.line_offsets[i - 1]
         else:
             col = 1 + span.start
 
-        # Avoid issues when file doesn't have a new line at the end, and
-        # the last string has attributes
-        if i >= len(self.offsets_and_lines):
-            i -= 1
+        return (col, i + 1)
+
+
+class LintError(NamedTuple):
+    """Error found by the linter.
+
+    Errors about the whole file don't have a position (line and col are
+    None), errors outside of messages and terms don't have a message ID.
+    root_folder is the root folder including the file, if known: errors
+    about the whole file are reported relative to it.
+    """
+
+    path: str
+    message_id: str
+    rule: str
+    line: int
+    col: int
+    msg: str
+    root_folder: str = None
+
+
+def format_error(error, file_path=None):
+    """Format an error for output.
+
+    file_path is the path to display, by default the path relative to the
+    current folder. Errors about the whole file are displayed relative to
+    their root folder instead, if known.
+    """
+
+    if error.line is None:
+        if error.root_folder is not None:
+            file_path = os.path.relpath(error.path, error.root_folder)
+        elif file_path is None:
+            file_path = os.path.relpath(error.path)
+        return f"""
+            File path: {file_path}
+            Error ({error.rule}): {error.msg}"""
+
+    if file_path is None:
+        file_path = os.path.relpath(error.path)
+    message_id = error.message_id if error.message_id is not None else "-"
+
+    return f"""
+            File path: {file_path}
+            Message ID: {message_id}
+            Position: line {error.line} column {error.col}
+            Error ({error.rule}): {error.msg}"""
+
+
+def format_errors(errors):
+    """Format errors for output, computing relative paths once per file."""
 
-        return (col, self.offsets_and_lines[i][1])
+    file_paths = {}
+    for error in errors:
+        file_path = file_paths.get(error.path)
+        if file_path is None:
+            file_path = file_paths[error.path] = os.path.relpath(error.path)
+        yield format_error(error, file_path)
+
+
+def get_line_offsets(contents):
+    """Return an array with the offset of each new line.
+
+    The Fluent AST contains spans of start and end offsets in the file.
+    The offset of the new line ending line N is at index N - 1, so that
+    errors can be reported using line and column.
+    """
+
+    return array("l", [m.start() for m in re.finditer(r"\n", contents)])
 
 
 def get_offsets_and_lines(contents):
     """Return a list consisting of tuples of (offset, line).
 
-    The Fluent AST contains spans of start and end offsets in the file.
-    This function returns a list of offsets and line numbers so that errors
-    can be reported using line and column.
+    Same as get_line_offsets(), with the line number ending at each offset.
+    Kept for compatibility, Linter accepts both formats.
     """
-    line = 1
-    result = []
-    for m in re.finditer(r"\n", contents):
-        result.append((m.start(), line))
-        line += 1
-    return result
+
+    return [(offset, line) for line, offset in enumerate(get_line_offsets(contents), 1)]
+
+
+def missing_final_newline(contents):
+    """Check if the file doesn't end with a new line (MI02).
+
+    Files ending with other whitespace are accepted, only the last character
+    needs to be checked.
+    """
+
+    return bool(contents) and not contents[-1].isspace()
 
 
 def get_newlines_count_after(span, contents):
@@ -632,60 +1084,640 @@ def get_newlines_count_before(span, contents):
     return count
 
 
-def lint(file_paths, config_path):
-    # Get list of FTL files
-    files = {}
-    total_files = 0
-    for fp in file_paths:
-        files[fp] = get_file_list(os.path.abspath(fp))
-        total_files += len(files[fp])
-    print(f"Files to analyze: {total_files}.")
+def get_config_file(config_path):
+    """Return the path of the configuration file to use.
+
+    If config_path is not provided, the config.yml file stored next to this
+    script is used.
+    """
 
-    # Get config, including exclusions
     if config_path:
-        config_file = config_path
-    else:
-        config_file = os.path.join(
-            os.path.dirname(os.path.realpath(__file__)), "config.yml"
-        )
+        return config_path
+
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), "config.yml")
+
 
-    # Warn if a config file is provided but missing
+def load_config(config_path):
+    """Load the configuration, including exclusions.
+
+    If config_path is not provided, the config.yml file stored next to this
+    script is used.
+    """
+    config_file = get_config_file(config_path)
+
+    # Warn if a config file is provided but missing. Use stderr, since
+    # structured output may already have been written to stdout.
     if config_path and not os.path.exists(config_file):
-        print(f"Configuration file not found: {config_file}")
+        print(f"Configuration file not found: {config_file}", file=sys.stderr)
 
     if os.path.exists(config_file):
         with open(config_file) as f:
-            config = list(yaml.safe_load_all(f))[0]
+            return list(yaml.safe_load_all(f))[0]
+
+    return {}
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_plan():
+    """Return the compiled configuration shipped with the linter.
+
+    The file is only read once per process.
+    """
+
+    return compile_config(load_config(None))
+
+
+def uses_identifier_index(plan):
+    """Check if checks across files (MI03, MI04) are enabled."""
+
+    return plan.mi03 or plan.mi04
+
+
+class IdentifierIndex:
+    """Index of message and term identifiers across files.
+
+    The index is built one file at a time. Names are interned and files are
+    stored as numeric IDs, to keep memory usage low on large trees. Term
+    references are only stored if the term is not defined yet when the file
+    is added.
+    """
+
+    def __init__(self):
+        self.paths = []
+        # First definition of each identifier, as (file ID, line, col).
+        # Term identifiers include the leading dash.
+        self.definitions = {}
+        # Identifiers already defined in another file, as (name, file ID,
+        # line, col)
+        self.duplicates = []
+        # Term references without a definition, as (name, file ID, line, col)
+        self.unresolved = []
+
+    def add_file(self, path, identifiers):
+        file_id = len(self.paths)
+        self.paths.append(path)
+
+        for name, line, col in identifiers["messages"] + identifiers["terms"]:
+            name = sys.intern(name)
+            definition = self.definitions.get(name)
+            if definition is None:
+                self.definitions[name] = (file_id, line, col)
+            elif definition[0] != file_id:
+                self.duplicates.append((name, file_id, line, col))
+
+        for name, line, col in identifiers["term_references"]:
+            if name not in self.definitions:
+                self.unresolved.append((sys.intern(name), file_id, line, col))
+
+    def get_errors(self, plan):
+        """Return errors for duplicated identifiers and undefined terms."""
+
+        errors = []
+        if plan.mi03:
+            for name, file_id, line, col in self.duplicates:
+                path = self.paths[file_id]
+                if is_excluded(plan, "MI03", name, path):
+                    continue
+                first_path = self.paths[self.definitions[name][0]]
+                msg = (
+                    f"Identifier {name} is already defined in "
+                    f"{os.path.relpath(first_path)} "
+                    f"(line {self.definitions[name][1]})."
+                )
+                errors.append((file_id, LintError(path, name, "MI03", line, col, msg)))
+
+        if plan.mi04:
+            for name, file_id, line, col in self.unresolved:
+                path = self.paths[file_id]
+                if name in self.definitions or is_excluded(plan, "MI04", name, path):
+                    continue
+                msg = f"Term {name} is not defined in any file."
+                errors.append((file_id, LintError(path, name, "MI04", line, col, msg)))
+
+        # Report errors in the same order as files were analyzed
+        errors.sort(key=lambda e: (e[0], e[1].line, e[1].col))
+
+        return [e[1] for e in errors]
+
+
+def lint_file(
+    path, root_folder, config, changed_lines=None, profiler=None, parse_cache=None
+):
+    """Lint a single FTL file.
+
+    Return a tuple with the list of LintError, and the identifiers defined and
+    referenced in the file if checks across files are enabled (None
+    otherwise). The config can be a dictionary or a compiled RulePlan.
+
+    If changed_lines is set, errors in messages and terms are only reported
+    if they include one of these lines. If a Profiler is provided, timings
+    and counters for the file are added to it. If a ParseCache is provided,
+    the parsed file is loaded from it when available.
+    """
+
+    start = time.perf_counter()
+    contents = read_contents(path)
+    if profiler is not None:
+        profiler.add_time(path, "io", time.perf_counter() - start)
+
+    return lint_contents(
+        path, root_folder, config, contents, changed_lines, profiler, parse_cache
+    )
+
+
+def lint_contents(
+    path,
+    root_folder,
+    config,
+    contents,
+    changed_lines=None,
+    profiler=None,
+    parse_cache=None,
+):
+    """Lint the content of a FTL file, same as lint_file().
+
+    New lines in contents are expected to be already translated, like when
+    reading the file in text mode.
+    """
+
+    plan = compile_config(config)
+    results = []
+    # Ensure that the file has an empty line at the end
+    if missing_final_newline(contents):
+        msg = "Missing empty line at the end of the file"
+        results.append(LintError(path, None, "MI02", None, None, msg, root_folder))
+
+    linter_class = Linter if profiler is None else profiler.get_linter_class(Linter)
+    start = time.perf_counter()
+    # Line offsets are only computed if needed, e.g. to report errors
+    linter = linter_class(path, root_folder, plan, contents)
+    linter.changed_lines = changed_lines
+    resource = parse(contents) if parse_cache is None else parse_cache.parse(contents)
+    parsed = time.perf_counter()
+    linter.visit(resource)
+    results.extend(linter.errors)
+    if profiler is not None:
+        profiler.add_time(path, "parse", parsed - start)
+        profiler.add_time(path, "visit", time.perf_counter() - parsed)
+        profiler.add_linter(path, contents, linter, results)
+    identifiers = linter.get_identifiers() if uses_identifier_index(plan) else None
+
+    return results, identifiers
+
+
+# Configuration and parse cache used by worker processes, sent once when the
+# pool starts.
+_worker_config = None
+_worker_parse_cache = None
+
+
+def _init_worker(config, parse_cache=None):
+    global _worker_config, _worker_parse_cache
+    _worker_config = config
+    _worker_parse_cache = parse_cache
+
+
+def _lint_worker(task, changed_lines=None):
+    root_folder, path = task
+    return lint_file(
+        path,
+        root_folder,
+        _worker_config,
+        changed_lines,
+        parse_cache=_worker_parse_cache,
+    )
+
+
+def _lint_item(root_folder, config, item, profiler=None):
+    path, contents = item
+    if contents is None:
+        return lint_file(path, root_folder, config, profiler=profiler)
+
+    return lint_contents(path, root_folder, config, contents, profiler=profiler)
+
+
+def _lint_item_worker(root_folder, item):
+    return _lint_item(root_folder, _worker_config, item)
+
+
+def get_cpu_count():
+    """Return the number of CPUs the current process can use.
+
+    Containers and CI runners often restrict processes to some of the CPUs
+    of the machine, which os.cpu_count() doesn't take into account.
+    """
+
+    if hasattr(os, "process_cpu_count"):
+        # Python 3.13+, also honors PYTHON_CPU_COUNT
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+
+    return os.cpu_count() or 1
+
+
+def iter_lint_tasks(
+    tasks, config, jobs=None, changed_lines=None, profiler=None, parse_cache=None
+):
+    """Lint a list of (root_folder, path) tasks.
+
+    Yield the result of lint_file() for each task, in the same order, as
+    soon as it's available. If provided, changed_lines is a list with the
+    changed lines for each task. Files are analyzed in a single process if a
+    Profiler is provided.
+    """
+
+    if changed_lines is None:
+        changed_lines = [None] * len(tasks)
+
+    # Use one process per CPU by default, but never more than the number of files
+    if jobs is None:
+        jobs = get_cpu_count()
+    jobs = min(jobs, len(tasks))
+
+    if jobs <= 1 or profiler is not None:
+        for (root_folder, path), lines in zip(tasks, changed_lines):
+            yield lint_file(path, root_folder, config, lines, profiler, parse_cache)
+        return
+
+    # Each worker receives the config once, files are distributed in chunks.
+    # Executor.map() returns results in the same order as the tasks.
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(config, parse_cache)
+    ) as executor:
+        yield from executor.map(_lint_worker, tasks, changed_lines, chunksize=chunksize)
+
+
+def get_files(file_paths, changed_since=None, list_files=None):
+    """Get the FTL files to analyze, grouped by root folder.
+
+    Paths can be root folders, or FTL files within them. If files are
+    provided, root folders are only used to report relative paths and check
+    exclusions, and they are not scanned for other files. Without root
+    folders, the folder of each file is used. If a git revision
+    is provided, only files changed since that revision are considered.
+
+    Return a tuple with a dictionary (root folder to sorted list of files),
+    a dictionary with the changed lines of each file, and a boolean set if
+    only part of the files in the root folders is included.
+    """
+
+    if list_files is None:
+        list_files = get_file_list
+
+    root_folders = [fp for fp in file_paths if not is_ftl_file(fp)]
+    file_list = [fp for fp in file_paths if is_ftl_file(fp)]
+
+    if file_list:
+        if not root_folders:
+            root_folders = sorted(
+                {os.path.dirname(os.path.abspath(fp)) for fp in file_list}
+            )
+        files = map_files_to_roots(file_list, root_folders)
+    else:
+        files = {fp: None for fp in root_folders}
+    file_changes = {}
+    for fp, paths in files.items():
+        if changed_since:
+            changes = get_changed_files(fp, changed_since)
+            file_changes.update(changes)
+            if paths is None:
+                files[fp] = sorted(changes)
+            else:
+                files[fp] = [path for path in paths if path in changes]
+        elif paths is None:
+            files[fp] = list_files(os.path.abspath(fp))
+
+    return files, file_changes, bool(changed_since or file_list)
+
+
+def get_shard(files, shard):
+    """Return the files included in a shard, grouped like get_files().
+
+    shard is a (index, count) tuple, with index starting from 1. Files are
+    split by size, so that shards include a similar amount of content: the
+    largest files are assigned first, each one to the shard with the
+    smallest total size so far. The split only depends on the list of files
+    and their sizes, so every node running a shard computes the same one.
+    """
+
+    index, count = shard
+    tasks = [
+        (root_folder, path) for root_folder, paths in files.items() for path in paths
+    ]
+    sizes = {task: os.path.getsize(task[1]) for task in tasks}
+
+    # Heap of (total size, shard index)
+    totals = [(0, i) for i in range(count)]
+    selected = set()
+    for task in sorted(tasks, key=lambda t: (-sizes[t], t)):
+        total, i = heapq.heappop(totals)
+        if i == index - 1:
+            selected.add(task)
+        heapq.heappush(totals, (total + sizes[task], i))
+
+    return {
+        root_folder: [path for path in paths if (root_folder, path) in selected]
+        for root_folder, paths in files.items()
+    }
+
+
+def iter_lint_files(
+    files,
+    plan,
+    jobs=None,
+    cache=None,
+    file_changes=None,
+    partial=False,
+    profiler=None,
+    parse_cache=None,
+):
+    """Lint files grouped by root folder, as returned by get_files().
+
+    If a cache is provided, only files that changed since they were stored
+    in it are analyzed. If file_changes is provided, only errors in changed
+    messages are reported, and the cache is not used. Checks across files
+    are skipped if partial is set, since they need all files. If a Profiler
+    is provided, timings and counters are added to it. Files are parsed
+    using parse_cache, if provided.
+
+    Yield (path, errors) for each file, in order, as soon as it's analyzed.
+    Errors from checks across files are yielded at the end, grouped by file.
+    """
+
+    tasks = [
+        (root_folder, path) for root_folder, paths in files.items() for path in paths
+    ]
+
+    if file_changes is not None:
+        # Results filtered by changed lines can't be cached
+        changed_lines = [file_changes.get(path) for _, path in tasks]
+        file_results = iter_lint_tasks(
+            tasks, plan, jobs, changed_lines, profiler, parse_cache
+        )
+    elif cache is None:
+        file_results = iter_lint_tasks(
+            tasks, plan, jobs, profiler=profiler, parse_cache=parse_cache
+        )
     else:
-        config = {}
+        file_results = _iter_cached_tasks(
+            tasks, plan, jobs, cache, profiler, parse_cache
+        )
+
+    # Checks across files need the full list of files
+    index = IdentifierIndex() if uses_identifier_index(plan) and not partial else None
+    for (root_folder, path), (file_errors, identifiers) in zip(tasks, file_results):
+        yield path, file_errors
+        if index is not None:
+            index.add_file(path, identifiers)
+    if index is not None:
+        yield from _iter_index_errors(index, plan, profiler)
+
+
+def _iter_index_errors(index, plan, profiler=None):
+    start = time.perf_counter()
+    errors = index.get_errors(plan)
+    if profiler is not None:
+        profiler.add_method("get_errors", 1, time.perf_counter() - start)
+    for path, file_errors in itertools.groupby(errors, lambda e: e.path):
+        yield path, list(file_errors)
+
+
+def _iter_cached_tasks(tasks, plan, jobs, cache, profiler=None, parse_cache=None):
+    # Only lint files that changed since the cache was written
+    digests = []
+    cached_results = []
+    for root_folder, path in tasks:
+        digests.append(cache.digest(path))
+        cached_results.append(cache.get(root_folder, path, digests[-1]))
+    pending = iter_lint_tasks(
+        [task for task, r in zip(tasks, cached_results) if r is None],
+        plan,
+        jobs,
+        profiler=profiler,
+        parse_cache=parse_cache,
+    )
 
+    try:
+        for (root_folder, path), digest, r in zip(tasks, digests, cached_results):
+            if r is None:
+                r = next(pending)
+                cache.set(root_folder, path, digest, r)
+            yield r
+    finally:
+        # Also store partial results, if the caller stops early
+        cache.save()
+
+
+def lint(
+    file_paths,
+    config_path,
+    jobs=None,
+    cache_path=None,
+    changed_since=None,
+    changed_messages=False,
+    shard=None,
+):
     results = []
-    for root_folder, paths in files.items():
-        for path in paths:
-            # Ensure that the file has an empty line at the end
-            with open(path, "r", encoding="utf-8") as f:
-                file_content = f.readlines()
-                if len(file_content) > 0:
-                    last_line = file_content[-1]
-                    if last_line == last_line.rstrip():
-                        rel_path = os.path.relpath(path, root_folder)
-                        error_msg = f"""
-            File path: {rel_path}
-            Error (MI02): Missing empty line at the end of the file"""
-                        results.append(error_msg)
-
-                # Reset position after reading the whole content and lint
-                f.seek(0)
-                contents = f.read()
-                linter = Linter(
-                    path, root_folder, config, contents, get_offsets_and_lines(contents)
-                )
-                linter.visit(parse(contents))
-                results.extend(linter.results)
+    for _, errors in iter_lint(
+        file_paths,
+        config_path,
+        jobs,
+        cache_path,
+        changed_since,
+        changed_messages,
+        shard=shard,
+    ):
+        results.extend(errors)
 
     return results
 
 
+def lint_iter(files, config=None, root_folder=None, jobs=1, profiler=None):
+    """Lint FTL files, yielding (path, errors) for each of them.
+
+    files can be any iterable of paths, or of (path, contents) tuples to
+    analyze content already in memory. config can be a configuration
+    dictionary or a compiled RulePlan, and defaults to the configuration
+    shipped with the linter. Nothing is printed.
+
+    Files are consumed lazily, and yielded in the same order. With more than
+    one job, files are analyzed in parallel, but only a few of them per job
+    ahead of the caller. Closing the generator cancels pending work. Errors
+    from checks across files are yielded at the end, grouped by file.
+
+    If a Profiler is provided, timings and counters are added to it, and
+    files are analyzed in a single process.
+    """
+
+    plan = get_default_plan() if config is None else compile_config(config)
+    if root_folder is None:
+        root_folder = os.curdir
+
+    def normalize(item):
+        if isinstance(item, tuple):
+            path, contents = item
+            return os.fspath(path), decode_contents(contents)
+        return os.fspath(item), None
+
+    items = map(normalize, files)
+    if jobs <= 1 or profiler is not None:
+        results = (
+            (item[0], _lint_item(root_folder, plan, item, profiler)) for item in items
+        )
+    else:
+        results = _iter_parallel(items, root_folder, plan, jobs)
+
+    index = IdentifierIndex() if uses_identifier_index(plan) else None
+    for path, (file_errors, identifiers) in results:
+        yield path, file_errors
+        if index is not None:
+            index.add_file(path, identifiers)
+    if index is not None:
+        yield from _iter_index_errors(index, plan, profiler)
+
+
+def lint_batch(items, config=None):
+    """Lint FTL snippets in memory.
+
+    items is an iterable of (name, contents) pairs, contents can be strings
+    or UTF-8 bytes. config can be a configuration dictionary or a compiled
+    RulePlan, and defaults to the configuration shipped with the linter.
+    Snippets are independent, so checks across files are not run.
+
+    Return a list of (name, errors) tuples, in the same order.
+    """
+
+    plan = get_default_plan() if config is None else compile_config(config)
+    plan = plan._replace(mi03=False, mi04=False)
+
+    return [
+        (name, lint_contents(name, os.curdir, plan, decode_contents(contents))[0])
+        for name, contents in items
+    ]
+
+
+def decode_contents(contents):
+    """Decode contents, and translate new lines like when reading text files."""
+
+    if isinstance(contents, bytes):
+        contents = contents.decode("utf-8")
+    if "\r" not in contents:
+        return contents
+
+    return contents.replace("\r\n", "\n").replace("\r", "\n")
+
+
+# Files larger than this are mapped in memory, instead of being copied to a
+# buffer before decoding them.
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def read_contents(path):
+    """Read a FTL file, decoding it and translating new lines like in text mode.
+
+    The file is read once, as bytes.
+    """
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return decode_contents(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            contents = str(data, "utf-8")
+
+    return decode_contents(contents)
+
+
+def _iter_parallel(items, root_folder, plan, jobs):
+    # Submit files one at a time, keeping a limited number of them in
+    # flight, instead of Executor.map() which consumes all items upfront.
+    pending = collections.deque()
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(plan,)
+    )
+    try:
+        for item in items:
+            future = executor.submit(_lint_item_worker, root_folder, item)
+            pending.append((item[0], future))
+            if len(pending) >= jobs * 2:
+                path, future = pending.popleft()
+                yield path, future.result()
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown()
+
+
+def iter_lint(
+    file_paths,
+    config_path,
+    jobs=None,
+    cache_path=None,
+    changed_since=None,
+    changed_messages=False,
+    quiet=False,
+    profiler=None,
+    shard=None,
+    cache_dir=None,
+    cache_size=None,
+):
+    """Same as lint(), yielding (path, errors) for each file.
+
+    The number of files is printed before analyzing them, unless quiet is
+    set. If a Profiler is provided, timings and counters are added to it.
+    If shard is set, only the files in that shard are analyzed (see
+    get_shard()), and checks across files are skipped. If cache_dir is set,
+    results and parsed files are stored in that folder (see SharedCache and
+    ParseCache), limited to cache_size megabytes, instead of a cache file.
+    """
+
+    files, file_changes, partial = get_files(file_paths, changed_since)
+    if shard is not None:
+        files = get_shard(files, shard)
+        partial = True
+    if not quiet:
+        total_files = sum(len(paths) for paths in files.values())
+        print(f"Files to analyze: {total_files}.")
+
+    config = load_config(config_path)
+    plan = compile_config(config)
+
+    cache = None
+    parse_cache = None
+    if cache_dir:
+        from .cache import ParseCache
+
+        # Parsed files don't depend on the configuration, they're also used
+        # when results can't be cached.
+        max_size = cache_size * 1024 * 1024 if cache_size else None
+        parse_cache = ParseCache(cache_dir, max_size)
+    if not changed_messages:
+        file_changes = None
+        if cache_dir:
+            from .cache import SharedCache
+
+            cache = SharedCache(cache_dir, config, version, max_size)
+        elif cache_path:
+            from .cache import ResultCache
+
+            # Entries of files not analyzed are only removed after a full run
+            cache = ResultCache(cache_path, config, version, prune=not partial)
+
+    try:
+        yield from iter_lint_files(
+            files, plan, jobs, cache, file_changes, partial, profiler, parse_cache
+        )
+    finally:
+        # The results cache evicts old entries from the same folder if it's
+        # used, otherwise the parse cache does it.
+        if parse_cache is not None and cache is None:
+            parse_cache.save()
+
+
 def get_file_list(path):
     """Get the list of supported files."""
 
@@ -699,13 +1731,160 @@ def get_file_list(path):
     return file_list
 
 
-def main():
-    # Read command line input parameters
-    parser = argparse.ArgumentParser()
+def is_ftl_file(path):
+    """Check if the path is a FTL file, instead of a root folder."""
+
+    return path.endswith(".ftl") and not os.path.isdir(path)
+
+
+def map_files_to_roots(file_list, root_folders):
+    """Group FTL files by root folder.
+
+    Each file is assigned to the most specific root folder including it, and
+    ignored with a warning if there is none (or if it doesn't exist). Return
+    a dictionary with root folders as keys, in the same order, and sorted
+    lists of absolute file paths as values.
+    """
+
+    roots = [(root, os.path.join(os.path.abspath(root), "")) for root in root_folders]
+    files = {root: set() for root in root_folders}
+    for path in file_list:
+        abs_path = os.path.abspath(path)
+        if not os.path.isfile(abs_path):
+            print(f"Ignoring {path}: file not found", file=sys.stderr)
+            continue
+        matches = [
+            (len(abs_root), root)
+            for root, abs_root in roots
+            if abs_path.startswith(abs_root)
+        ]
+        if matches:
+            files[max(matches)[1]].add(abs_path)
+        else:
+            print(f"Ignoring {path}: not in any root folder", file=sys.stderr)
+
+    return {root: sorted(paths) for root, paths in files.items()}
+
+
+def read_file_list(source, null_separated=False):
+    """Read a list of paths from a file, or from stdin if source is "-"."""
+
+    if source == "-":
+        data = sys.stdin.read()
+    else:
+        with open(source, encoding="utf-8") as f:
+            data = f.read()
+
+    paths = data.split("\0") if null_separated else data.splitlines()
+
+    return [path for path in paths if path]
+
+
+def git(folder, *args):
+    """Run a git command in folder and return its output."""
+
+    return subprocess.run(
+        ["git", "-C", folder, "-c", "core.quotepath=off", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def get_changed_files(path, rev):
+    """Get FTL files in path changed since rev, including untracked files.
+
+    Return a dictionary with the absolute path of each file as key, and the
+    set of changed line numbers as value (None if the whole file changed).
+    """
+
+    folder = os.path.abspath(path)
+    changed_files = {}
+
+    # Deleted files are not included, and paths are relative to folder.
+    # Renamed files are reported as added, since a pure rename doesn't have
+    # any changed lines.
+    diff = git(
+        folder,
+        "diff",
+        "--no-color",
+        "--no-ext-diff",
+        "--no-renames",
+        "--relative",
+        "--diff-filter=d",
+        "--src-prefix=a/",
+        "--dst-prefix=b/",
+        "--unified=0",
+        rev,
+        "--",
+        ".",
+    )
+    current_lines = None
+    for line in diff.splitlines():
+        if line.startswith("+++ b/"):
+            filename = line[len("+++ b/") :].rstrip("\t")
+            if filename.endswith(".ftl"):
+                current_lines = set()
+                changed_files[os.path.join(folder, filename)] = current_lines
+            else:
+                current_lines = None
+        elif line.startswith("@@") and current_lines is not None:
+            match = hunk_header_re.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                if count == 0:
+                    # Only removed lines, consider the lines around them as
+                    # changed.
+                    count = 2
+                current_lines.update(range(start, start + count))
+
+    untracked = git(folder, "ls-files", "--others", "--exclude-standard", "--", ".")
+    for filename in untracked.splitlines():
+        if filename.endswith(".ftl"):
+            changed_files[os.path.join(folder, filename)] = None
+
+    return changed_files
+
+
+def positive_int(value):
+    """Argument type for options that require a positive integer."""
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+
+    return number
+
+
+def shard_type(value):
+    """Argument type for --shard, return a (index, count) tuple."""
+
+    try:
+        index, count = (int(v) for v in value.split("/"))
+    except ValueError:
+        index = count = 0
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not a valid shard, expected K/N with 1 <= K <= N"
+        )
+
+    return index, count
+
+
+def get_parser(prog=None):
+    """Get the parser for command line arguments."""
+
+    parser = argparse.ArgumentParser(prog=prog)
     parser.add_argument(
         "files_paths",
-        help="Path(s) to root folder with FTL files for reference locale (accept multiple values)",
-        nargs="+",
+        help="Path(s) to root folder with FTL files for reference locale (accept "
+        "multiple values). FTL files can also be provided, in that case only those "
+        "files are analyzed, and root folders are not scanned",
+        nargs="*",
     )
     parser.add_argument(
         "--config",
@@ -717,15 +1896,201 @@ def main():
         help="Only print the current version of the program",
         version="moz-fluent-linter version: " + version,
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        help="Number of files to analyze in parallel. Defaults to the number of CPUs "
+        "available",
+        type=positive_int,
+    )
+    parser.add_argument(
+        "--cache",
+        help="Store results in a cache file, and only analyze files that changed "
+        "since the last run (default location: .fluent_linter_cache)",
+        nargs="?",
+        const=".fluent_linter_cache",
+        dest="cache_path",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Store results in a cache folder, which can be shared by several "
+        "machines or runs at the same time (e.g. on a network volume). Results "
+        "are stored by file content, configuration and linter version",
+        metavar="DIR",
+    )
+    parser.add_argument(
+        "--cache-size",
+        help="With --cache-dir, maximum size of the cache folder in megabytes. "
+        "The least recently used results are removed when it grows over this "
+        "size (default: 256)",
+        type=positive_int,
+        metavar="MB",
+    )
+    parser.add_argument(
+        "--changed-since",
+        help="Only analyze files changed since this git revision (e.g. HEAD), "
+        "including untracked files",
+        metavar="REV",
+    )
+    parser.add_argument(
+        "--changed-messages",
+        help="With --changed-since, only report errors in messages and terms "
+        "including changed lines. Errors about the file structure are always "
+        "reported",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--files-from",
+        help="Read the list of FTL files to analyze from a file, one per line. "
+        "Use - to read from stdin",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--null",
+        "-0",
+        help="With --files-from, paths are separated by NUL characters instead "
+        "of new lines",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--format",
+        help="Output format. Errors are written as each file is analyzed",
+        choices=["text", "jsonl", "sarif", "checkstyle"],
+        default="text",
+    )
+    parser.add_argument(
+        "--watch",
+        help="Keep running, and analyze files again when they change. Only "
+        "errors added or resolved are printed after the first run",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Measure the time spent on each file, rule group and visitor "
+        "method, and print a summary to stderr. If a file is provided, the "
+        "report is stored there as JSON instead. Files are analyzed in a "
+        "single process",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--shard",
+        help="Only analyze shard K of N, e.g. 2/4. Files are split in shards "
+        "with a similar total size. Checks across files are skipped. Use "
+        "moz-fluent-lint-merge to combine the results of all shards",
+        type=shard_type,
+        metavar="K/N",
+    )
+
+    return parser
+
 
-    results = lint(args.files_paths, args.config)
-    if results:
-        for r in results:
-            print(r)
-        sys.exit(1)
+def write_results(results, output_format="text", shard=None):
+    """Print (path, errors) tuples as they're available.
+
+    shard is the (index, count) tuple of the shard analyzed, if any. Return
+    the number of errors.
+    """
+
+    error_count = 0
+    if output_format == "text":
+        for _, errors in results:
+            for r in format_errors(errors):
+                print(r, flush=True)
+            error_count += len(errors)
+        if not error_count:
+            print("No errors found.")
     else:
-        print("No errors found.")
+        from .formatters import formatters
+
+        formatter = formatters[output_format](sys.stdout, version, shard)
+        formatter.start()
+        for path, errors in results:
+            formatter.add_file(path, errors)
+            error_count += len(errors)
+        formatter.end()
+
+    return error_count
+
+
+def run(argv=None, iter_function=iter_lint, prog=None):
+    """Lint files according to command line arguments, and print results.
+
+    iter_function is called with the same arguments as iter_lint(). Return
+    the exit code.
+    """
+
+    parser = get_parser(prog)
+    args = parser.parse_intermixed_args(argv)
+
+    if args.files_from:
+        args.files_paths += read_file_list(args.files_from, args.null)
+    if not args.files_paths:
+        parser.error("at least one root folder or file is required")
+    if args.changed_messages and not args.changed_since:
+        parser.error("--changed-messages requires --changed-since")
+    if args.watch and args.format != "text":
+        parser.error("--watch only supports the text format")
+    if args.watch and args.profile:
+        parser.error("--profile can't be used with --watch")
+    if args.watch and args.shard:
+        parser.error("--shard can't be used with --watch")
+    if args.cache_dir and args.cache_path:
+        parser.error("--cache and --cache-dir can't be used together")
+    if args.cache_size and not args.cache_dir:
+        parser.error("--cache-size requires --cache-dir")
+
+    profiler = None
+    if args.profile:
+        from .profiling import Profiler
+
+        profiler = Profiler()
+
+    try:
+        if args.watch:
+            from .watch import watch
+
+            return watch(
+                args.files_paths,
+                args.config,
+                args.jobs,
+                args.changed_since,
+                args.changed_messages,
+            )
+        results = iter_function(
+            args.files_paths,
+            args.config,
+            args.jobs,
+            args.cache_path,
+            args.changed_since,
+            args.changed_messages,
+            quiet=args.format != "text",
+            profiler=profiler,
+            shard=args.shard,
+            cache_dir=args.cache_dir,
+            cache_size=args.cache_size,
+        )
+        error_count = write_results(results, args.format, args.shard)
+    except subprocess.CalledProcessError as e:
+        print(f"Error running git: {e.stderr.strip()}", file=sys.stderr)
+        return 2
+
+    if profiler is not None:
+        if args.profile == "-":
+            print(profiler.format_table(), file=sys.stderr)
+        else:
+            import json
+
+            with open(args.profile, "w", encoding="utf-8") as f:
+                json.dump(profiler.report(), f, indent=2)
+                f.write("\n")
+
+    return 1 if error_count else 0
+
+
+def main():
+    sys.exit(run())
 
 
 if __name__ == "__main__":
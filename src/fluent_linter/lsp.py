@@ -0,0 +1,314 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import argparse
+import io
+import json
+import os
+import sys
+import traceback
+
+from contextlib import redirect_stderr, redirect_stdout
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from fluent.syntax import ast, parse
+
+from .daemon import LintSession
+from .linter import Linter, file_level_rules, missing_final_newline
+
+
+class DiagnosticLinter(Linter):
+    """Linter storing errors with their span, instead of formatted output."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.diagnostics = []
+
+    def add_error(self, node, message_id, rule, msg):
+        if not self.report_entry and rule not in file_level_rules:
+            return
+
+        self.diagnostics.append((node.span, rule, msg))
+
+
+def read_message(stream):
+    """Read a JSON-RPC message, return None at the end of the stream.
+
+    Raise ValueError if the headers or the content are invalid.
+    """
+
+    headers = {}
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" not in headers:
+        raise ValueError("Missing Content-Length header")
+
+    return json.loads(stream.read(int(headers["content-length"])))
+
+
+def write_message(stream, message):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def uri_to_path(uri):
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+
+    # url2pathname() also decodes percent-encoded characters
+    return url2pathname(parsed.path)
+
+
+def lint_document(path, root_folder, plan, contents):
+    """Lint the content of a document.
+
+    Return a list of (start, end, rule, message), where start and end are
+    (line, column) tuples, both starting from 1. Columns are counted in
+    characters. The range is limited to the first line of the node.
+    """
+
+    ftl_linter = DiagnosticLinter(path, root_folder, plan, contents)
+    ftl_linter.visit(parse(contents))
+
+    lines = contents.split("\n")
+    errors = []
+    for span, rule, msg in ftl_linter.diagnostics:
+        (col, line) = ftl_linter.span_to_line_and_col(span)
+        (end_col, end_line) = ftl_linter.span_to_line_and_col(
+            ast.Span(span.end, span.end)
+        )
+        if end_line != line:
+            end_col = len(lines[line - 1]) + 1
+        errors.append(((line, col), (line, end_col), rule, msg))
+
+    # Same check as lint_file()
+    if missing_final_newline(contents):
+        position = (len(lines), len(lines[-1]) + 1)
+        msg = "Missing empty line at the end of the file"
+        errors.append((position, position, "MI02", msg))
+
+    return errors
+
+
+class LanguageServer:
+    """Language server publishing lint errors as diagnostics.
+
+    Documents are synchronized in full, and analyzed every time they are
+    opened or changed, using the content of the editor buffer. Checks
+    across files are not available.
+    """
+
+    def __init__(self, reader, writer, config_path=None):
+        self.reader = reader
+        self.writer = writer
+        self.config_path = config_path
+        self.session = LintSession()
+        self.root_folders = []
+        self.documents = {}
+        self.utf16 = True
+        self.shutdown_requested = False
+
+        self.handlers = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+        }
+
+    def run(self):
+        """Handle messages until the exit notification, return the exit code."""
+
+        while True:
+            try:
+                message = read_message(self.reader)
+            except ValueError as e:
+                # The stream is still usable if the content was invalid
+                error = {"code": -32700, "message": f"Parse error: {e}"}
+                self.send({"id": None, "error": error})
+                continue
+            if message is None:
+                return 1
+            if not isinstance(message, dict):
+                error = {"code": -32600, "message": "Invalid request"}
+                self.send({"id": None, "error": error})
+                continue
+            method = message.get("method")
+            if method == "exit":
+                return 0 if self.shutdown_requested else 1
+
+            handler = self.handlers.get(method)
+            if "id" not in message:
+                # Notification, unknown ones can be ignored
+                if handler is not None:
+                    try:
+                        self.call(handler, message.get("params") or {})
+                    except Exception:
+                        self.log_error()
+                continue
+
+            if handler is None:
+                error = {"code": -32601, "message": f"Unknown method: {method}"}
+                self.send({"id": message["id"], "error": error})
+                continue
+            try:
+                result = self.call(handler, message.get("params") or {})
+            except Exception as e:
+                self.log_error()
+                error = {"code": -32603, "message": f"Error handling {method}: {e!r}"}
+                self.send({"id": message["id"], "error": error})
+            else:
+                self.send({"id": message["id"], "result": result})
+
+    def call(self, handler, params):
+        """Call a handler, sending anything it prints as a log message.
+
+        Output on stdout would corrupt the messages sent to the client.
+        """
+
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                return handler(params)
+        finally:
+            if output.getvalue():
+                self.notify(
+                    "window/logMessage",
+                    {"type": 2, "message": output.getvalue().strip()},
+                )
+
+    def log_error(self):
+        self.notify("window/logMessage", {"type": 1, "message": traceback.format_exc()})
+
+    def send(self, message):
+        write_message(self.writer, {"jsonrpc": "2.0", **message})
+
+    def notify(self, method, params):
+        self.send({"method": method, "params": params})
+
+    def initialize(self, params):
+        options = params.get("initializationOptions") or {}
+        if options.get("config"):
+            self.config_path = options["config"]
+
+        folders = params.get("workspaceFolders") or []
+        uris = [f["uri"] for f in folders] or [params.get("rootUri")]
+        self.root_folders = [p for p in map(uri_to_path, filter(None, uris)) if p]
+
+        # Columns are computed in characters, use them if the client allows it
+        encodings = params.get("capabilities", {}).get("general", {})
+        encodings = encodings.get("positionEncodings") or []
+        self.utf16 = "utf-32" not in encodings
+
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+                # Full synchronization of documents
+                "textDocumentSync": {"openClose": True, "change": 1},
+            },
+            "serverInfo": {"name": "moz-fluent-linter"},
+        }
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+
+        return None
+
+    def did_open(self, params):
+        document = params["textDocument"]
+        uri = document["uri"]
+        if document.get("languageId") != "fluent" and not uri.endswith(".ftl"):
+            return
+        self.documents[uri] = document["text"]
+        self.publish(uri, document.get("version"))
+
+    def did_change(self, params):
+        document = params["textDocument"]
+        if document["uri"] not in self.documents:
+            return
+        changes = params["contentChanges"]
+        if changes:
+            self.documents[document["uri"]] = changes[-1]["text"]
+        self.publish(document["uri"], document.get("version"))
+
+    def did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self.notify(
+                "textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []}
+            )
+
+    def get_root_folder(self, path):
+        abs_path = os.path.abspath(path)
+        roots = [
+            root
+            for root in self.root_folders
+            if abs_path.startswith(os.path.join(os.path.abspath(root), ""))
+        ]
+
+        return max(roots, key=len) if roots else os.path.dirname(abs_path)
+
+    def publish(self, uri, version=None):
+        # Translate new lines like when reading files from disk
+        contents = self.documents[uri].replace("\r\n", "\n").replace("\r", "\n")
+        path = uri_to_path(uri) or uri
+        try:
+            _, plan = self.session.get_config(self.config_path)
+            errors = lint_document(path, self.get_root_folder(path), plan, contents)
+        except Exception:
+            self.log_error()
+            return
+
+        lines = contents.split("\n")
+
+        def position(line, col):
+            text = lines[line - 1][: col - 1] if line <= len(lines) else ""
+            character = len(text.encode("utf-16-le")) // 2 if self.utf16 else len(text)
+            return {"line": line - 1, "character": character}
+
+        diagnostics = [
+            {
+                "range": {"start": position(*start), "end": position(*end)},
+                "severity": 1,
+                "code": rule,
+                "source": "moz-fluent-linter",
+                "message": msg,
+            }
+            for start, end, rule, msg in errors
+        ]
+        params = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.notify("textDocument/publishDiagnostics", params)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Language server for the Fluent linter, communicating over "
+        "stdin and stdout"
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to config file. It can also be provided by the client in "
+        "the initialization options",
+    )
+    args = parser.parse_args()
+
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer, args.config)
+    sys.exit(server.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import argparse
+import json
+import sys
+
+from .linter import LintError, shard_type, write_results
+
+
+def read_results(source):
+    """Read errors from a file written with --format jsonl.
+
+    Use - to read from stdin. Return a list of LintError, and the (index,
+    count) tuple of the shard from the final record, or None if the results
+    don't end with one, e.g. if the run was interrupted.
+    """
+
+    if source == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(source, encoding="utf-8") as f:
+            lines = f.readlines()
+
+    errors = []
+    shard = None
+    for line in lines:
+        if not line.strip():
+            continue
+        if shard is not None:
+            raise ValueError(f"{source}: unexpected result after the end of the shard")
+        e = json.loads(line)
+        if isinstance(e, dict) and "shard" in e:
+            try:
+                shard = shard_type(e["shard"])
+            except (argparse.ArgumentTypeError, AttributeError):
+                raise ValueError(f"{source}: unexpected shard {line.strip()}")
+            if e.get("complete") is not True:
+                shard = None
+            continue
+        try:
+            errors.append(
+                LintError(
+                    e["path"],
+                    e["message_id"],
+                    e["rule"],
+                    e["line"],
+                    e["column"],
+                    e["message"],
+                )
+            )
+        except (KeyError, TypeError):
+            raise ValueError(f"{source}: unexpected result {line.strip()}")
+
+    return errors, shard
+
+
+def merge_results(sources):
+    """Merge errors from several shards.
+
+    Raise ValueError if a shard is incomplete, or if some shards are missing
+    or repeated. Return a list of (path, errors) tuples, sorted by path.
+    Errors within a file keep their original order.
+    """
+
+    files = {}
+    shards = []
+    for source in sources:
+        errors, shard = read_results(source)
+        if shard is None:
+            raise ValueError(f"{source}: incomplete results, the shard didn't finish")
+        shards.append(shard)
+        for error in errors:
+            files.setdefault(error.path, []).append(error)
+
+    count = shards[0][1]
+    if any(c != count for _, c in shards):
+        raise ValueError("results from shards of different splits")
+    if sorted(i for i, _ in shards) != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - {i for i, _ in shards})
+        if missing:
+            raise ValueError(
+                "missing results for shards "
+                + ", ".join(f"{i}/{count}" for i in missing)
+            )
+        raise ValueError("results for the same shard provided more than once")
+
+    return sorted(files.items())
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="moz-fluent-lint-merge",
+        description="Combine the results of runs with --shard in a single report",
+    )
+    parser.add_argument(
+        "results",
+        help="Results of each shard, written with --shard and --format jsonl. Use - "
+        "to read from stdin",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--format",
+        help="Output format",
+        choices=["text", "jsonl", "sarif", "checkstyle"],
+        default="text",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        results = merge_results(args.results)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading results: {e}", file=sys.stderr)
+        return 2
+
+    return 1 if write_results(results, args.format) else 0
+
+
+def main():
+    sys.exit(run())
+
+
+if __name__ == "__main__":
+    main()
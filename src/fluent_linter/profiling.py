@@ -0,0 +1,256 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import time
+
+from fluent.syntax import ast
+
+
+# Group of rules checked by each method of the linter. Methods not listed
+# here only walk the tree.
+rule_groups = {
+    "check_typography": "typography",
+    "get_errors": "across_files",
+    "visit_Attribute": "syntax",
+    "visit_Comment": "comments",
+    "visit_FunctionReference": "syntax",
+    "visit_GroupComment": "comments",
+    "visit_Identifier": "identifiers",
+    "visit_Junk": "junk",
+    "visit_Message": "messages",
+    "visit_MessageReference": "syntax",
+    "visit_Placeable": "placeables",
+    "visit_ResourceComment": "comments",
+    "visit_SelectExpression": "syntax",
+    "visit_Term": "messages",
+    "visit_TermReference": "syntax",
+    "visit_TextElement": "banned_words",
+    "visit_VariableReference": "syntax",
+}
+
+# Text scanned by rules for each type of node
+scanned_attributes = {
+    "Comment": "content",
+    "GroupComment": "content",
+    "Identifier": "name",
+    "ResourceComment": "content",
+    "TextElement": "value",
+}
+
+
+class ProfilingMixin:
+    """Measure the time spent in each method of a Linter.
+
+    Times are exclusive: the time spent in a nested visit is only counted
+    for the nested method. Statistics are stored in self.stats, as a
+    dictionary of method name to [calls, seconds, bytes scanned].
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = {}
+        self.nodes = 0
+        # Time spent in nested calls, for each call being measured
+        self.nested = []
+
+    def measure(self, name, function, *args):
+        self.nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.nested.pop()
+            if self.nested:
+                self.nested[-1] += elapsed
+            stats = self.stats.setdefault(name, [0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += elapsed - nested
+
+    def add_bytes(self, name, text):
+        if text:
+            self.stats.setdefault(name, [0, 0.0, 0])[2] += len(text.encode("utf-8"))
+
+    def visit(self, node):
+        if not isinstance(node, ast.BaseNode):
+            # Lists are visited one item at a time, other values are ignored
+            super().visit(node)
+            return
+
+        node_name = type(node).__name__
+        name = f"visit_{node_name}"
+        if not hasattr(self, name):
+            name = "generic_visit"
+        self.nodes += 1
+        self.measure(name, super().visit, node)
+        if node_name in scanned_attributes:
+            self.add_bytes(name, getattr(node, scanned_attributes[node_name]))
+
+    def check_typography(self, node):
+        self.measure("check_typography", super().check_typography, node)
+
+    def get_message_text(self, node):
+        text = super().get_message_text(node)
+        self.add_bytes("check_typography", text)
+
+        return text
+
+
+class Profiler:
+    """Timings and counters collected while linting.
+
+    Pass an instance as the profiler argument of lint_iter(), iter_lint() or
+    lint_file() to collect data, then call report() or format_table(). Files
+    are analyzed in a single process while profiling, results loaded from a
+    cache are not measured.
+    """
+
+    def __init__(self):
+        # Path to statistics about the file
+        self.files = {}
+        # Method name to [calls, seconds, bytes scanned]
+        self.methods = {}
+        self.linter_classes = {}
+
+    def get_linter_class(self, linter_class):
+        """Return a subclass of linter_class including ProfilingMixin."""
+
+        if linter_class not in self.linter_classes:
+            self.linter_classes[linter_class] = type(
+                f"Profiling{linter_class.__name__}", (ProfilingMixin, linter_class), {}
+            )
+
+        return self.linter_classes[linter_class]
+
+    def get_file(self, path):
+        file_stats = self.files.get(path)
+        if file_stats is None:
+            file_stats = self.files[path] = {
+                "bytes": 0,
+                "io_seconds": 0.0,
+                "parse_seconds": 0.0,
+                "visit_seconds": 0.0,
+                "nodes": 0,
+                "errors": 0,
+            }
+
+        return file_stats
+
+    def add_time(self, path, step, seconds):
+        """Add time spent on a step (io, parse or visit) for a file."""
+
+        self.get_file(path)[f"{step}_seconds"] += seconds
+
+    def add_linter(self, path, contents, linter, errors):
+        """Add counters from a linter, after visiting a file."""
+
+        file_stats = self.get_file(path)
+        file_stats["bytes"] += len(contents.encode("utf-8"))
+        file_stats["nodes"] += linter.nodes
+        file_stats["errors"] += len(errors)
+        for name, stats in linter.stats.items():
+            self.add_method(name, *stats)
+
+    def add_method(self, name, calls, seconds, scanned=0):
+        method_stats = self.methods.setdefault(name, [0, 0.0, 0])
+        method_stats[0] += calls
+        method_stats[1] += seconds
+        method_stats[2] += scanned
+
+    def report(self):
+        """Return the collected data as a dictionary, ready to store as JSON."""
+
+        def stats(calls, seconds, scanned):
+            return {"calls": calls, "seconds": seconds, "bytes": scanned}
+
+        groups = {}
+        for name, (calls, seconds, scanned) in self.methods.items():
+            group = rule_groups.get(name, "traversal")
+            group_stats = groups.setdefault(group, [0, 0.0, 0])
+            group_stats[0] += calls
+            group_stats[1] += seconds
+            group_stats[2] += scanned
+
+        totals = {
+            "files": len(self.files),
+            "bytes": 0,
+            "io_seconds": 0.0,
+            "parse_seconds": 0.0,
+            "visit_seconds": 0.0,
+            "nodes": 0,
+            "errors": 0,
+        }
+        for file_stats in self.files.values():
+            for key, value in file_stats.items():
+                totals[key] += value
+
+        return {
+            "totals": totals,
+            "groups": {
+                group: stats(*values)
+                for group, values in sorted(groups.items(), key=lambda g: -g[1][1])
+            },
+            "methods": {
+                name: {"group": rule_groups.get(name, "traversal"), **stats(*values)}
+                for name, values in sorted(self.methods.items(), key=lambda m: -m[1][1])
+            },
+            "files": [
+                {"path": path, **file_stats}
+                for path, file_stats in sorted(
+                    self.files.items(), key=lambda f: -self.file_seconds(f[1])
+                )
+            ],
+        }
+
+    @staticmethod
+    def file_seconds(file_stats):
+        return (
+            file_stats["io_seconds"]
+            + file_stats["parse_seconds"]
+            + file_stats["visit_seconds"]
+        )
+
+    def format_table(self, top_files=10):
+        """Format the report as tables, listing the slowest files."""
+
+        report = self.report()
+        totals = report["totals"]
+        lines = [
+            f"Files: {totals['files']}, {totals['bytes']:,} bytes, "
+            f"{totals['nodes']:,} nodes. I/O: {totals['io_seconds'] * 1000:.1f} ms, "
+            f"parse: {totals['parse_seconds'] * 1000:.1f} ms, "
+            f"visit: {totals['visit_seconds'] * 1000:.1f} ms.",
+            "",
+            f"{'rule group':<26}{'calls':>10}{'ms':>10}{'bytes':>12}",
+        ]
+        for group, stats in report["groups"].items():
+            lines.append(
+                f"{group:<26}{stats['calls']:>10,}{stats['seconds'] * 1000:>10.1f}"
+                f"{stats['bytes']:>12,}"
+            )
+
+        lines += ["", f"{'method':<26}{'calls':>10}{'ms':>10}{'bytes':>12}"]
+        for name, stats in report["methods"].items():
+            lines.append(
+                f"{name:<26}{stats['calls']:>10,}{stats['seconds'] * 1000:>10.1f}"
+                f"{stats['bytes']:>12,}"
+            )
+
+        lines += [
+            "",
+            f"{'file':<40}{'bytes':>10}{'I/O ms':>9}{'parse ms':>10}{'visit ms':>10}",
+        ]
+        for file_stats in report["files"][:top_files]:
+            path = os.path.relpath(file_stats["path"])
+            if len(path) > 39:
+                path = "..." + path[-36:]
+            lines.append(
+                f"{path:<40}{file_stats['bytes']:>10,}"
+                f"{file_stats['io_seconds'] * 1000:>9.1f}"
+                f"{file_stats['parse_seconds'] * 1000:>10.1f}"
+                f"{file_stats['visit_seconds'] * 1000:>10.1f}"
+            )
+
+        return "\n".join(lines)
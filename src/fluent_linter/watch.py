@@ -0,0 +1,229 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import subprocess
+import sys
+import time
+
+from collections import Counter
+from contextlib import redirect_stdout
+
+from .daemon import LintSession
+from .linter import format_errors
+
+
+class InotifyWatcher:
+    """Wait for changes in folders with inotify (only available on Linux)."""
+
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+    # IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    mask = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, folders):
+        # Adding a watch for a folder already watched is a no-op, and folders
+        # removed and created again need a new watch.
+        for folder in folders:
+            self.libc.inotify_add_watch(self.fd, os.fsencode(folder), self.mask)
+
+    def wait(self, timeout=None, settle=0.1):
+        """Wait for changes, return True if any happened before timeout.
+
+        Events are read until no new events arrive for settle seconds, since
+        saving a file usually triggers several of them.
+        """
+
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return False
+        while select.select([self.fd], [], [], settle)[0]:
+            try:
+                os.read(self.fd, 65536)
+            except BlockingIOError:
+                pass
+
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Check for changes at regular intervals.
+
+    Since files that didn't change are not analyzed again, checking for
+    changes amounts to reading the metadata of files and folders.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+
+    def watch(self, folders):
+        pass
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+
+        return True
+
+    def close(self):
+        pass
+
+
+def get_watcher(poll_interval=None):
+    """Return an inotify watcher if available, a polling watcher otherwise."""
+
+    if poll_interval is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError, TypeError):
+            # inotify or libc not available
+            pass
+
+    return PollingWatcher(poll_interval or 1.0)
+
+
+def diff_results(old, new):
+    """Return the errors added and resolved between two lists of results.
+
+    Errors are compared without their position, so that errors moving to a
+    different line, e.g. after adding a message above them, are not reported.
+    """
+
+    def key(error):
+        return (error.path, error.message_id, error.rule, error.msg)
+
+    def subtract(errors, other):
+        counts = Counter(map(key, other))
+        result = []
+        for error in errors:
+            if counts[key(error)] > 0:
+                counts[key(error)] -= 1
+            else:
+                result.append(error)
+        return result
+
+    return subtract(new, old), subtract(old, new)
+
+
+class LintWatch:
+    """Lint files again when they change, keeping results in memory."""
+
+    def __init__(
+        self,
+        file_paths,
+        config_path,
+        jobs=None,
+        changed_since=None,
+        changed_messages=False,
+    ):
+        self.session = LintSession(jobs)
+        self.file_paths = file_paths
+        self.config_path = config_path
+        self.changed_since = changed_since
+        self.changed_messages = changed_messages
+        self.results = []
+
+    def lint(self):
+        """Lint files, and return the errors added and resolved."""
+
+        results = self.session.lint(
+            self.file_paths,
+            self.config_path,
+            changed_since=self.changed_since,
+            changed_messages=self.changed_messages,
+            skip_unreadable=True,
+        )
+        added, resolved = diff_results(self.results, results)
+        self.results = results
+
+        return added, resolved
+
+    def get_folders(self):
+        """Return the folders to watch for changes."""
+
+        folders = set()
+        for fp in self.file_paths:
+            if self.session.linter.is_ftl_file(fp):
+                folders.add(os.path.dirname(os.path.abspath(fp)))
+            else:
+                # Folders are indexed by the session when listing files
+                path = os.path.abspath(fp)
+                self.session.list_files(path)
+                folders.update(self.session.file_lists[path][0])
+        if self.config_path:
+            # Editors often save files by replacing them, watch the folder
+            folders.add(os.path.dirname(os.path.abspath(self.config_path)))
+
+        return sorted(folders)
+
+
+def print_diff(added, resolved):
+    timestamp = time.strftime("%H:%M:%S")
+    print(
+        f"\n[{timestamp}] New errors: {len(added)}. Resolved errors: {len(resolved)}."
+    )
+    if added:
+        print("Added:")
+        for r in format_errors(added):
+            print(r)
+    if resolved:
+        print("Resolved:")
+        for r in format_errors(resolved):
+            print(r)
+
+
+def watch(
+    file_paths,
+    config_path,
+    jobs=None,
+    changed_since=None,
+    changed_messages=False,
+    poll_interval=None,
+):
+    """Lint files, then lint them again every time they change.
+
+    After the first run, only errors added or resolved are printed. If a run
+    fails, e.g. because a folder was removed or git failed, the error is
+    printed and the files are analyzed again on the next change. Return the
+    exit code, based on the last results, when interrupted.
+    """
+
+    lint_watch = LintWatch(
+        file_paths, config_path, jobs, changed_since, changed_messages
+    )
+    watcher = get_watcher(poll_interval)
+    try:
+        lint_watch.lint()
+        for r in format_errors(lint_watch.results):
+            print(r)
+        print(f"Errors found: {len(lint_watch.results)}. Watching for changes.")
+
+        while True:
+            watcher.watch(lint_watch.get_folders())
+            if not watcher.wait():
+                continue
+            try:
+                with redirect_stdout(io.StringIO()):
+                    added, resolved = lint_watch.lint()
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Error analyzing files: {e}", file=sys.stderr)
+                continue
+            if added or resolved:
+                print_diff(added, resolved)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+    return 1 if lint_watch.results else 0
@@ -68,3 +68,22 @@ excluded_sentence2 = This is a <b>black list</b>
         }
         results = self.checkContent(config, content)
         self.assertEqual(len(results), 0)
+
+    def testCO02Matcher(self):
+        content = """
+multiple = This ALIAS is a nickname
+"""
+        config = {
+            "CO02": {
+                "enabled": True,
+                "words": ["Nickname", "alias", "pseudonym"],
+            }
+        }
+        results = self.checkContent(config, content)
+        self.assertEqual(len(results), 1)
+        self.assertTrue("(nickname, alias)" in results[0])
+
+        # The matcher is built once and shared across instances
+        linter1 = linter.Linter("file.ftl", "root", config, content, [])
+        linter2 = linter.Linter("file.ftl", "root", config, content, [])
+        self.assertIs(linter1.banned_words_matcher, linter2.banned_words_matcher)
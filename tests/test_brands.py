@@ -87,3 +87,42 @@ good-account2 = Set up your { -brand-short-name } Account.
         self.assertEqual(len(results), 1)
         self.assertTrue("bad-monitor" in results[0])
         self.assertTrue("good-monitor" not in results[0])
+
+    def testCO01Combined(self):
+        content = """
+overlap = Welcome to Firefox Relay
+regex = Welcome to Mozilla VPN
+backreference = Welcome to Firefox Firefox
+no-brand = Welcome to Firefoxes
+"""
+
+        config = {
+            "CO01": {
+                "enabled": True,
+                "brands": ["Firefox", "Firefox Relay", "Mozilla (VPN|Monitor)"],
+            }
+        }
+        results = self.checkContent(config, content)
+        self.assertEqual(len(results), 3)
+        self.assertTrue("(Firefox, Firefox Relay)" in results[0])
+        self.assertTrue("(Mozilla (VPN|Monitor))" in results[1])
+        self.assertTrue("(Firefox)" in results[2])
+
+        # Patterns that can't be combined in a single expression
+        config = {
+            "CO01": {
+                "enabled": True,
+                "brands": [r"(Firefox) \1", "(?i)mozilla vpn"],
+            }
+        }
+        results = self.checkContent(config, content)
+        self.assertEqual(len(results), 2)
+        self.assertTrue("regex" in results[0])
+        self.assertTrue("backreference" in results[1])
+
+    def testBrandMatcher(self):
+        matcher = linter.get_brand_matcher(("Firefox", "Mozilla"))
+        self.assertIs(matcher, linter.get_brand_matcher(("Firefox", "Mozilla")))
+        self.assertEqual(matcher.findall("Mozilla Firefox"), ["Firefox", "Mozilla"])
+        self.assertEqual(matcher.findall("Thunderbird"), [])
+        self.assertEqual(linter.get_brand_matcher(()).findall("Firefox"), [])
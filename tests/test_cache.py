@@ -0,0 +1,325 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from src.fluent_linter import cache as cache_module, linter
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        self.files = []
+        for i in range(3):
+            path = os.path.join(self.root, f"test{i}.ftl")
+            with open(path, "w") as f:
+                f.write(f"test-{i} = Test's\n")
+            self.files.append(path)
+        self.cache_path = os.path.join(self.root, "cache")
+
+    def lint(self, config_path=None):
+        with redirect_stdout(io.StringIO()):
+            with mock.patch.object(
+                linter, "lint_file", wraps=linter.lint_file
+            ) as lint_file:
+                results = linter.lint(
+                    [self.root], config_path, jobs=1, cache_path=self.cache_path
+                )
+        linted = sorted(call.args[0] for call in lint_file.call_args_list)
+
+        return results, linted
+
+    def testCache(self):
+        results, linted = self.lint()
+        self.assertEqual(len(results), 3)
+        self.assertEqual(linted, self.files)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        # Nothing changed
+        cached_results, linted = self.lint()
+        self.assertEqual(cached_results, results)
+        self.assertEqual(linted, [])
+
+        # Only the modified file is analyzed again
+        with open(self.files[1], "w") as f:
+            f.write("test-1 = Test\n")
+        cached_results, linted = self.lint()
+        self.assertEqual(len(cached_results), 2)
+        self.assertEqual(linted, [self.files[1]])
+
+    def testConfigChange(self):
+        self.lint()
+
+        config_path = os.path.join(self.root, "config.yml")
+        with open(config_path, "w") as f:
+            f.write("TE01:\n    exclusions:\n        messages: [test-0]\n")
+        results, linted = self.lint(config_path)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(linted, self.files)
+
+    def testPrune(self):
+        self.lint()
+        os.rename(self.files[2], os.path.join(self.root, "renamed.ftl"))
+
+        # Entries are kept after a partial run
+        with redirect_stdout(io.StringIO()):
+            linter.lint([self.root, self.files[0]], None, cache_path=self.cache_path)
+        with open(self.cache_path) as f:
+            self.assertEqual(len(json.load(f)["files"]), 3)
+
+        results, linted = self.lint()
+        self.assertEqual(len(results), 3)
+        self.assertEqual(linted, [os.path.join(self.root, "renamed.ftl")])
+        with open(self.cache_path) as f:
+            entries = json.load(f)["files"]
+        self.assertEqual(len(entries), 3)
+        self.assertFalse(any(key.endswith("test2.ftl") for key in entries))
+
+    def testVersions(self):
+        self.lint()
+        with mock.patch.object(cache_module, "fluent_syntax_version", "0.0.1"):
+            _, linted = self.lint()
+        self.assertEqual(linted, self.files)
+
+    def testInvalidCache(self):
+        with open(self.cache_path, "w") as f:
+            f.write("not json")
+        results, linted = self.lint()
+        self.assertEqual(len(results), 3)
+        self.assertEqual(linted, self.files)
+
+
+class TestSharedCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.cache_dir = os.path.join(self.folder, "cache")
+
+        # Two checkouts of the same files, in different folders
+        self.roots = []
+        for checkout in ["first", "second"]:
+            root = os.path.join(self.folder, checkout)
+            os.makedirs(root)
+            for i in range(3):
+                with open(os.path.join(root, f"test{i}.ftl"), "w") as f:
+                    f.write(f"test-{i} = Test's\n")
+            self.roots.append(root)
+
+    def lint(self, root, config_path=None):
+        with mock.patch.object(
+            linter, "lint_file", wraps=linter.lint_file
+        ) as lint_file:
+            results = linter.iter_lint(
+                [root], config_path, jobs=1, quiet=True, cache_dir=self.cache_dir
+            )
+            results = [e for _, errors in results for e in errors]
+
+        return results, len(lint_file.call_args_list)
+
+    def testSharedCache(self):
+        results, linted = self.lint(self.roots[0])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(linted, 3)
+
+        # Results are shared with other checkouts
+        results, linted = self.lint(self.roots[1])
+        self.assertEqual(linted, 0)
+        self.assertEqual(
+            [e.path for e in results],
+            [os.path.join(self.roots[1], f"test{i}.ftl") for i in range(3)],
+        )
+
+        # A different configuration uses different entries
+        config_path = os.path.join(self.folder, "config.yml")
+        with open(config_path, "w") as f:
+            f.write("TE01:\n    enabled: false\n")
+        results, linted = self.lint(self.roots[1], config_path)
+        self.assertEqual(linted, 3)
+
+    def testCommandLine(self):
+        with redirect_stdout(io.StringIO()):
+            exit_code = linter.run(
+                [self.roots[0], "--cache-dir", self.cache_dir, "--cache-size", "1"]
+            )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self.lint(self.roots[1])[1], 0)
+
+        for argv in [["--cache-size", "1"], ["--cache-dir", "a", "--cache", "b"]]:
+            with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                linter.run([self.roots[0], *argv])
+
+    def testExcludedFiles(self):
+        path = os.path.join(self.roots[0], "test0.ftl")
+        config = {"TE01": {"exclusions": {"files": [path]}}}
+        cache = cache_module.SharedCache(self.cache_dir, config, "1.0")
+        digest = cache.digest(path)
+        other_path = os.path.join(self.roots[1], "test0.ftl")
+        self.assertEqual(digest, cache.digest(other_path))
+
+        cache.set(self.roots[0], path, digest, [[], None])
+        self.assertEqual(cache.get(self.roots[0], path, digest), ([], None))
+        self.assertIsNone(cache.get(self.roots[1], other_path, digest))
+
+    def testWriteErrors(self):
+        with mock.patch.object(
+            cache_module, "write_entry", side_effect=PermissionError
+        ):
+            results, linted = self.lint(self.roots[0])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(linted, 3)
+
+        # The temporary file was already removed by another run
+        def replace(src, dst):
+            os.unlink(src)
+            raise OSError(28, "No space left on device")
+
+        entry_path = os.path.join(self.cache_dir, "ab", "entry")
+        with mock.patch.object(cache_module.os, "replace", side_effect=replace):
+            with self.assertRaisesRegex(OSError, "No space left"):
+                cache_module.write_entry(entry_path, b"data")
+
+    def testEviction(self):
+        cache = cache_module.SharedCache(self.cache_dir, {}, "1.0", max_size=1000)
+        error = ["", "test", "TE01", 1, 1, "x" * 100]
+        paths = []
+        for i in range(20):
+            digest = f"{i:064x}"
+            cache.set("root", "test.ftl", digest, [[error], None])
+            paths.append(cache.entry_path("test.ftl", digest))
+            # Entries are ordered by modification time
+            os.utime(paths[-1], (i, i))
+        # Reading an entry marks it as recently used
+        self.assertIsNotNone(cache.get("root", "test.ftl", f"{0:064x}"))
+        cache.save()
+
+        remaining = [os.path.exists(p) for p in paths]
+        self.assertTrue(remaining[0])
+        self.assertFalse(remaining[1])
+        self.assertTrue(remaining[19])
+        sizes = sum(os.path.getsize(p) for p, r in zip(paths, remaining) if r)
+        self.assertLessEqual(sizes, 1000)
+
+        # Evicted entries are cache misses
+        self.assertIsNone(cache.get("root", "test.ftl", f"{1:064x}"))
+
+        # The folder isn't listed again until the interval is over
+        for i in range(20, 40):
+            cache.set("root", "test.ftl", f"{i:064x}", [[error], None])
+        with mock.patch.object(cache_module.os, "walk") as walk:
+            cache.save()
+        walk.assert_not_called()
+        cache_module.evict_entries(self.cache_dir, 1000, interval=0)
+        self.assertLessEqual(
+            sum(
+                os.path.getsize(os.path.join(dirpath, filename))
+                for dirpath, _, filenames in os.walk(self.cache_dir)
+                for filename in filenames
+            ),
+            1000,
+        )
+
+    def testVersions(self):
+        cache = cache_module.SharedCache(self.cache_dir, {}, "1.0")
+        with mock.patch.object(cache_module, "fluent_syntax_version", "0.0.1"):
+            other_cache = cache_module.SharedCache(self.cache_dir, {}, "1.0")
+        self.assertNotEqual(cache.key, other_cache.key)
+        with mock.patch.object(
+            cache_module.platform, "python_version", return_value="3.0.0"
+        ):
+            other_cache = cache_module.SharedCache(self.cache_dir, {}, "1.0")
+        self.assertNotEqual(cache.key, other_cache.key)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        self.cache = cache_module.ParseCache(self.folder)
+        self.contents = "# Comment\nfoo = Foo { $bar }\n    .attr = Attribute\n"
+
+    def parse(self, contents):
+        with mock.patch.object(
+            cache_module, "parse", wraps=cache_module.parse
+        ) as parse:
+            resource = self.cache.parse(contents)
+
+        return resource, parse.call_count
+
+    def testParseCache(self):
+        resource, parsed = self.parse(self.contents)
+        self.assertEqual(parsed, 1)
+        cached, parsed = self.parse(self.contents)
+        self.assertEqual(parsed, 0)
+        # Including spans
+        self.assertTrue(cached.equals(resource, ignored_fields=[]))
+
+        # Different content
+        _, parsed = self.parse(self.contents + "bar = Bar\n")
+        self.assertEqual(parsed, 1)
+
+    def write_entries(self, data):
+        for dirpath, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                with open(os.path.join(dirpath, filename), "wb") as f:
+                    f.write(data)
+
+    def testInvalidEntry(self):
+        resource, _ = self.parse(self.contents)
+        self.write_entries(b"not a resource")
+
+        cached, parsed = self.parse(self.contents)
+        self.assertEqual(parsed, 1)
+        self.assertTrue(cached.equals(resource))
+        # The entry was written again
+        _, parsed = self.parse(self.contents)
+        self.assertEqual(parsed, 0)
+
+        # Only AST nodes are created from entries
+        for node in [
+            {"type": "sys"},
+            {"type": "cast", "typ": None, "val": None},
+            {"type": "Resource", "body": [{"type": "to_json", "value": 1}]},
+            {"type": "Identifier", "name": "foo", "span": None},
+        ]:
+            self.write_entries(zlib.compress(json.dumps(node).encode("utf-8")))
+            cached, parsed = self.parse(self.contents)
+            self.assertEqual(parsed, 1)
+            self.assertTrue(cached.equals(resource))
+
+    def testConfigChange(self):
+        root = os.path.join(self.folder, "root")
+        os.makedirs(root)
+        for i in range(3):
+            with open(os.path.join(root, f"test{i}.ftl"), "w") as f:
+                f.write(f"test-{i} = Test's\n")
+        cache_dir = os.path.join(self.folder, "cache")
+
+        def lint(config_path=None):
+            with mock.patch.object(
+                cache_module, "parse", wraps=cache_module.parse
+            ) as parse:
+                results = list(
+                    linter.iter_lint(
+                        [root], config_path, jobs=1, quiet=True, cache_dir=cache_dir
+                    )
+                )
+            return results, parse.call_count
+
+        results, parsed = lint()
+        self.assertEqual(parsed, 3)
+
+        # Results are not cached for this configuration, parsed files are
+        config_path = os.path.join(self.folder, "config.yml")
+        with open(config_path, "w") as f:
+            f.write("TE01:\n    enabled: false\n")
+        results, parsed = lint(config_path)
+        self.assertEqual(parsed, 0)
+        self.assertEqual(sum(len(errors) for _, errors in results), 0)
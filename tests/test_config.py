@@ -0,0 +1,97 @@
+import os
+import pickle
+import unittest
+
+from fluent.syntax import parse
+
+from src.fluent_linter import linter
+
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "test_linter.ftl")
+
+
+class TestConfig(unittest.TestCase):
+    def testDefaults(self):
+        plan = linter.compile_config({})
+        self.assertFalse(plan.id01)
+        self.assertFalse(plan.id02)
+        self.assertFalse(plan.brand_matcher)
+        self.assertFalse(plan.banned_words_matcher)
+        self.assertTrue(plan.te01 and plan.te05)
+        self.assertFalse(plan.sy01_disabled)
+        self.assertTrue(plan.gc and plan.rc)
+        self.assertFalse(plan.vc or plan.ps01)
+        self.assertFalse(plan.mi03 or plan.mi04)
+        self.assertEqual(plan.excluded_messages, frozenset())
+
+    def testCompile(self):
+        config = {
+            "ID02": {"enabled": True, "min_length": 9},
+            "CO01": {"enabled": True, "brands": ["Firefox"]},
+            "CO02": {"enabled": False, "words": ["alias"]},
+            "TE01": {"enabled": False, "exclusions": {"messages": ["foo"]}},
+            "SY05": {"disabled": True},
+            "GC": {"disabled": True},
+            "VC": {"disabled": False},
+            "ID01": {
+                "enabled": False,
+                "exclusions": {"messages": None, "files": ["file.ftl"]},
+            },
+        }
+        plan = linter.compile_config(config)
+        self.assertEqual(plan.id02_min_length, 9)
+        self.assertEqual(plan.brand_matcher.findall("Firefox"), ["Firefox"])
+        self.assertFalse(plan.banned_words_matcher)
+        self.assertFalse(plan.te01)
+        self.assertTrue(plan.sy05_disabled)
+        self.assertFalse(plan.gc)
+        self.assertTrue(plan.vc)
+        self.assertTrue(linter.is_excluded(plan, "TE01", "foo"))
+        self.assertFalse(linter.is_excluded(plan, "TE02", "foo"))
+        self.assertTrue(linter.is_excluded(plan, "ID01", "bar", "file.ftl"))
+        self.assertFalse(linter.is_excluded(plan, "ID01", "bar", "other.ftl"))
+
+        # Compiling a plan returns the same object
+        self.assertIs(linter.compile_config(plan), plan)
+
+        # Plans are immutable, and can be sent to worker processes
+        with self.assertRaises(AttributeError):
+            plan.te01 = True
+        self.assertEqual(
+            pickle.loads(pickle.dumps(plan)).excluded_files, plan.excluded_files
+        )
+
+    def testPruning(self):
+        with open(TEST_FILE, encoding="utf-8") as f:
+            content = f.read()
+        content += """
+### Resource comment after messages
+
+attributes-only =
+    .label = { "Label" }
+"""
+
+        def check(plan):
+            ftl_linter = linter.Linter(
+                "path", "root", plan, content, linter.get_offsets_and_lines(content)
+            )
+            ftl_linter.visit(parse(content))
+
+            return ftl_linter.results
+
+        configs = [
+            {},
+            {"ID01": {"enabled": True}, "TE01": {"enabled": False}},
+            {"SY05": {"disabled": True}, "GC": {"disabled": True}},
+            {f"TE0{i}": {"enabled": False} for i in range(1, 6)},
+            {"VC": {"disabled": False}, "SY04": {"disabled": True}},
+        ]
+        for config in configs:
+            plan = linter.compile_config(config)
+            full_plan = plan._replace(typography=True, walk_patterns=True)
+            self.assertEqual(check(plan), check(full_plan))
+
+        plan = linter.compile_config(configs[3])
+        self.assertFalse(plan.typography)
+        self.assertFalse(plan.walk_patterns)
+        self.assertTrue(any("RC01" in r for r in check(plan)))
@@ -0,0 +1,23 @@
+import random
+import unittest
+
+from fluent.syntax import ast, parse
+
+from benchmarks.corpus import generate_file
+
+
+class TestCorpus(unittest.TestCase):
+    def testGenerateFile(self):
+        content = generate_file(random.Random(1), 200)
+        self.assertEqual(content, generate_file(random.Random(1), 200))
+        self.assertNotEqual(content, generate_file(random.Random(2), 200))
+
+        # The corpus is valid FTL, including all kinds of entries
+        resource = parse(content)
+        types = {type(entry) for entry in resource.body}
+        self.assertNotIn(ast.Junk, types)
+        self.assertTrue(
+            {ast.Message, ast.Term, ast.ResourceComment, ast.GroupComment} <= types
+        )
+        entries = [e for e in resource.body if isinstance(e, (ast.Message, ast.Term))]
+        self.assertEqual(len(entries), 200)
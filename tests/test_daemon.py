@@ -0,0 +1,147 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from src.fluent_linter import daemon, linter
+
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "test_linter.ftl")
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        self.l10n = os.path.join(self.root, "l10n")
+        os.makedirs(os.path.join(self.l10n, "sub"))
+        shutil.copy(TEST_FILE, os.path.join(self.l10n, "test.ftl"))
+        with open(os.path.join(self.l10n, "sub", "clean.ftl"), "w") as f:
+            f.write("foo = Foo\n")
+
+        self.config = os.path.join(self.root, "config.yml")
+        with open(self.config, "w") as f:
+            f.write("ID01:\n    enabled: true\n")
+
+        self.socket_path = os.path.join(self.root, "daemon.sock")
+        server = daemon.LintServer(self.socket_path, jobs=1)
+        self.session = server.session
+        thread = threading.Thread(target=server.serve_until_stopped)
+        thread.start()
+
+        def stop():
+            daemon.send_request(self.socket_path, {"command": "stop"})
+            thread.join()
+            server.server_close()
+
+        self.addCleanup(stop)
+
+    def request(self, *argv):
+        return daemon.send_request(
+            self.socket_path,
+            {"command": "lint", "argv": list(argv), "cwd": self.root},
+        )
+
+    def local(self, *argv):
+        output = io.StringIO()
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            with redirect_stdout(output):
+                exit_code = linter.run(list(argv))
+        finally:
+            os.chdir(cwd)
+
+        return {"output": output.getvalue(), "exit_code": exit_code}
+
+    def testLint(self):
+        argv = ["l10n", "--config", "config.yml"]
+        response = self.request(*argv)
+        self.assertEqual(response["exit_code"], 1)
+        self.assertEqual(response, self.local(*argv))
+
+        # Results are cached
+        with mock.patch.object(linter, "lint_file", wraps=linter.lint_file) as m:
+            self.assertEqual(self.request(*argv), response)
+            m.assert_not_called()
+
+        # Changed files are analyzed again
+        clean_path = os.path.join(self.l10n, "sub", "clean.ftl")
+        with open(clean_path, "w") as f:
+            f.write("foo = Foo's\n")
+        new_path = os.path.join(self.l10n, "new.ftl")
+        with open(new_path, "w") as f:
+            f.write("bar = Bar")
+        with mock.patch.object(linter, "lint_file", wraps=linter.lint_file) as m:
+            response = self.request(*argv)
+            self.assertEqual(
+                sorted(call[0][0] for call in m.call_args_list),
+                [new_path, clean_path],
+            )
+        self.assertEqual(response, self.local(*argv))
+        self.assertIn("Files to analyze: 3.", response["output"])
+
+        # Changes to the configuration are picked up
+        with open(self.config, "w") as f:
+            f.write("TE01:\n    enabled: false\n")
+        response = self.request(*argv)
+        self.assertNotIn("TE01", response["output"])
+        self.assertEqual(response, self.local(*argv))
+
+    def testListFiles(self):
+        files = self.session.list_files(self.l10n)
+        self.assertEqual(files, linter.get_file_list(self.l10n))
+
+        os.remove(os.path.join(self.l10n, "sub", "clean.ftl"))
+        files = self.session.list_files(self.l10n)
+        self.assertEqual(files, [os.path.join(self.l10n, "test.ftl")])
+
+    def testGetConfig(self):
+        session = daemon.LintSession()
+        with mock.patch.object(
+            linter, "load_config", wraps=linter.load_config
+        ) as load_config:
+            # The default configuration is also loaded once
+            default = session.get_config(None)
+            self.assertEqual(session.get_config(None), default)
+            self.assertEqual(load_config.call_count, 1)
+
+            config, _ = session.get_config(self.config)
+            self.assertEqual(config, {"ID01": {"enabled": True}})
+            session.get_config(self.config)
+            self.assertEqual(load_config.call_count, 2)
+
+            # Reloaded when the file changes
+            with open(self.config, "w") as f:
+                f.write("ID01:\n    enabled: false\n")
+            os.utime(self.config, ns=(0, 0))
+            config, _ = session.get_config(self.config)
+            self.assertEqual(config, {"ID01": {"enabled": False}})
+            self.assertEqual(load_config.call_count, 3)
+
+    def testErrors(self):
+        response = self.request("--changed-messages", "l10n")
+        self.assertEqual(response["exit_code"], 2)
+        self.assertIn("--changed-messages requires --changed-since", response["output"])
+
+        response = daemon.send_request(self.socket_path, {"command": "unknown"})
+        self.assertEqual(response["exit_code"], 2)
+
+    def testInvalidJobs(self):
+        for jobs in ["0", "-3", "a"]:
+            argv = ["moz-fluent-lint-daemon", "serve", "socket", "--jobs", jobs]
+            with (
+                mock.patch.object(daemon, "serve") as serve,
+                mock.patch("sys.argv", argv),
+                redirect_stderr(io.StringIO()) as stderr,
+            ):
+                with self.assertRaises(SystemExit):
+                    daemon.main()
+            serve.assert_not_called()
+            self.assertIn("is not a positive integer", stderr.getvalue())
@@ -0,0 +1,108 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.fluent_linter import linter
+
+
+class TestFormatters(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        with open(os.path.join(self.root, "a.ftl"), "w") as f:
+            f.write('foo = Foo\'s <"quotes"> & more\nbar = Bar...\n')
+        with open(os.path.join(self.root, "b.ftl"), "w") as f:
+            f.write("baz = Baz")
+        with open(os.path.join(self.root, "c.ftl"), "w") as f:
+            f.write("clean = Clean\n")
+
+    def run_linter(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = linter.run([self.root, *argv])
+
+        return exit_code, output.getvalue()
+
+    def testJsonLines(self):
+        exit_code, output = self.run_linter("--format", "jsonl")
+        self.assertEqual(exit_code, 1)
+        errors = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([e["rule"] for e in errors], ["TE01", "TE04", "TE05", "MI02"])
+        self.assertEqual(
+            errors[0],
+            {
+                "path": os.path.relpath(os.path.join(self.root, "a.ftl")),
+                "message_id": "foo",
+                "rule": "TE01",
+                "line": 1,
+                "column": 1,
+                "message": errors[0]["message"],
+            },
+        )
+        self.assertIsNone(errors[3]["line"])
+
+    def testSarif(self):
+        exit_code, output = self.run_linter("--format", "sarif")
+        self.assertEqual(exit_code, 1)
+        run = json.loads(output)["runs"][0]
+        self.assertEqual(
+            [r["id"] for r in run["tool"]["driver"]["rules"]],
+            ["TE01", "TE04", "TE05", "MI02"],
+        )
+        result = run["results"][2]
+        self.assertEqual(result["ruleId"], "TE05")
+        location = result["locations"][0]
+        self.assertEqual(
+            location["physicalLocation"]["region"], {"startLine": 2, "startColumn": 1}
+        )
+        self.assertEqual(location["logicalLocations"], [{"name": "bar"}])
+
+    def testCheckstyle(self):
+        exit_code, output = self.run_linter("--format", "checkstyle")
+        self.assertEqual(exit_code, 1)
+        files = ET.fromstring(output).findall("file")
+        self.assertEqual(
+            [(os.path.basename(f.get("name")), len(f)) for f in files],
+            [("a.ftl", 3), ("b.ftl", 1), ("c.ftl", 0)],
+        )
+        error = files[0][0]
+        self.assertEqual(error.get("source"), "moz-fluent-linter.TE01")
+        self.assertTrue("foo’s" in error.get("message"))
+
+    def testNoErrors(self):
+        os.remove(os.path.join(self.root, "a.ftl"))
+        os.remove(os.path.join(self.root, "b.ftl"))
+        exit_code, output = self.run_linter("--format", "sarif")
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(json.loads(output)["runs"][0]["results"], [])
+
+        exit_code, output = self.run_linter()
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "Files to analyze: 1.\nNo errors found.\n")
+
+    def testMissingConfig(self):
+        missing = os.path.join(self.root, "missing.yml")
+        with redirect_stderr(io.StringIO()) as stderr:
+            _, output = self.run_linter("--format", "jsonl", "--config", missing)
+            for line in output.splitlines():
+                json.loads(line)
+
+            _, output = self.run_linter("--format", "sarif", "--config", missing)
+            self.assertEqual(len(json.loads(output)["runs"][0]["results"]), 4)
+        self.assertIn(f"Configuration file not found: {missing}", stderr.getvalue())
+
+    def testStreaming(self):
+        config = linter.compile_config({})
+        files, _, _ = linter.get_files([self.root])
+        results = linter.iter_lint_files(files, config, jobs=1)
+        path, errors = next(results)
+        self.assertEqual(path, os.path.join(self.root, "a.ftl"))
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len(list(results)), 2)
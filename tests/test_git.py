@@ -0,0 +1,91 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from contextlib import redirect_stdout
+
+from src.fluent_linter import linter
+
+
+class TestChangedSince(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        self.write(
+            "unchanged.ftl",
+            "unchanged = It's unchanged\n",
+        )
+        self.write(
+            "changed.ftl",
+            "first = It's the first\nsecond = Second\nthird = It's the third\n",
+        )
+        self.git("init", "-q")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "Initial commit")
+
+        self.write(
+            "changed.ftl",
+            "first = It's the first\nsecond = It's the second\n"
+            "third = It's the third\n\n\n### Resource comment\n",
+        )
+        self.write("new.ftl", "new = It's new\n")
+        self.write("other.txt", "Not a FTL file\n")
+
+    def write(self, filename, content):
+        with open(os.path.join(self.root, filename), "w") as f:
+            f.write(content)
+
+    def git(self, *args):
+        subprocess.run(
+            [
+                "git",
+                "-C",
+                self.root,
+                "-c",
+                "user.name=Test",
+                "-c",
+                "user.email=test@example.com",
+                *args,
+            ],
+            check=True,
+        )
+
+    def lint(self, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return linter.lint([self.root], None, jobs=1, **kwargs)
+
+    def testChangedFiles(self):
+        changes = linter.get_changed_files(self.root, "HEAD")
+        self.assertEqual(
+            changes,
+            {
+                os.path.join(self.root, "changed.ftl"): {2, 4, 5, 6},
+                os.path.join(self.root, "new.ftl"): None,
+            },
+        )
+
+    def testRenamedFile(self):
+        self.git("mv", "unchanged.ftl", "renamed.ftl")
+        changes = linter.get_changed_files(self.root, "HEAD")
+        self.assertEqual(changes[os.path.join(self.root, "renamed.ftl")], {1})
+        self.assertNotIn(os.path.join(self.root, "unchanged.ftl"), changes)
+
+    def testChangedSince(self):
+        results = self.lint(changed_since="HEAD")
+        self.assertEqual(len(results), 5)
+        self.assertFalse(any("unchanged" in r for r in results))
+
+        # Only errors in changed messages, and file level errors
+        results = self.lint(changed_since="HEAD", changed_messages=True)
+        self.assertEqual(len(results), 3)
+        self.assertTrue("second" in results[0])
+        self.assertTrue("RC01" in results[1])
+        self.assertTrue("new" in results[2])
+
+    def testInvalidRevision(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.lint(changed_since="invalid-revision")
@@ -73,3 +73,22 @@ foo1= bar
         # Test file exclusion
         results = self.checkContent("path/foo", "root", config, content)
         self.assertEqual(len(results), 0)
+
+    def testMI01(self):
+        content = """
+foo = bar
+foo-test = bar
+
+# Comment
+foo = bar
+foo-test = bar
+foo = bar
+"""
+        results = self.checkContent("path", "root", {}, content)
+        self.assertEqual(len(results), 3)
+        self.assertTrue("MI01" in results[0])
+        self.assertTrue("Position: line 5" in results[0])
+        self.assertTrue("first defined at line 2 column 1" in results[0])
+        self.assertTrue("foo-test" in results[1])
+        self.assertTrue("first defined at line 3 column 1" in results[1])
+        self.assertTrue("first defined at line 2 column 1" in results[2])
@@ -0,0 +1,295 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from src.fluent_linter import linter
+
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "test_linter.ftl")
+
+
+class TestLint(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        for folder in ["", "sub", "sub/nested"]:
+            os.makedirs(os.path.join(self.root, folder), exist_ok=True)
+            for i in range(3):
+                shutil.copy(TEST_FILE, os.path.join(self.root, folder, f"test{i}.ftl"))
+        with open(os.path.join(self.root, "no_newline.ftl"), "w") as f:
+            f.write("no-newline = Test")
+
+        self.config = os.path.join(self.root, "config.yml")
+        with open(self.config, "w") as f:
+            f.write("ID01:\n    enabled: true\n")
+
+    def lint(self, *args, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return linter.lint(*args, **kwargs)
+
+    def testSerial(self):
+        results = self.lint([self.root], self.config, jobs=1)
+        self.assertTrue(any(r.rule == "MI02" for r in results))
+        self.assertTrue(any(r.rule == "ID01" for r in results))
+        self.assertEqual(results[0].path, os.path.join(self.root, "no_newline.ftl"))
+        self.assertEqual(results[0].line, None)
+
+        formatted = list(linter.format_errors(results))
+        self.assertEqual(
+            formatted[0],
+            """
+            File path: no_newline.ftl
+            Error (MI02): Missing empty line at the end of the file""",
+        )
+        self.assertTrue("Message ID: " in formatted[1])
+
+    def testParallel(self):
+        serial = self.lint([self.root], self.config, jobs=1)
+        parallel = self.lint([self.root], self.config, jobs=4)
+        self.assertEqual(serial, parallel)
+
+        # More jobs than files
+        parallel = self.lint([self.root], self.config, jobs=100)
+        self.assertEqual(serial, parallel)
+
+    def testCpuCount(self):
+        cpu_count = linter.get_cpu_count()
+        self.assertGreaterEqual(cpu_count, 1)
+        self.assertLessEqual(cpu_count, os.cpu_count())
+        if hasattr(os, "sched_getaffinity") and not hasattr(os, "process_cpu_count"):
+            self.assertEqual(cpu_count, len(os.sched_getaffinity(0)))
+
+    def testIdentifierIndex(self):
+        root = os.path.join(self.root, "index")
+        os.makedirs(root)
+        files = {
+            "a.ftl": "-brand = Firefox\nfoo = Test { -brand }\n",
+            "b.ftl": "foo = Test\nbar = Test { -missing }\nbaz = Test { -other }\n",
+            "c.ftl": "-brand = Firefox\n-other = Other\nexcluded = { -excluded }\n",
+        }
+        for filename, content in files.items():
+            with open(os.path.join(root, filename), "w") as f:
+                f.write(content)
+
+        results = self.lint([root], self.config, jobs=1)
+        self.assertEqual(results, [])
+
+        with open(self.config, "w") as f:
+            f.write(
+                "MI03:\n    enabled: true\n"
+                "MI04:\n    enabled: true\n"
+                "    exclusions:\n        messages: [-excluded]\n"
+            )
+        results = self.lint([root], self.config, jobs=1)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].rule, "MI03")
+        self.assertEqual(results[0].path, os.path.join(root, "b.ftl"))
+        self.assertEqual((results[0].line, results[0].col), (1, 1))
+        self.assertTrue("Identifier foo is already defined in" in results[0].msg)
+        self.assertEqual(results[1].rule, "MI04")
+        self.assertEqual(results[1].msg, "Term -missing is not defined in any file.")
+        self.assertEqual(results[2].rule, "MI03")
+        self.assertEqual(results[2].message_id, "-brand")
+
+        self.assertEqual(self.lint([root], self.config, jobs=2), results)
+
+    def testFileList(self):
+        files = [
+            os.path.join(self.root, "sub", "test1.ftl"),
+            os.path.join(self.root, "sub", "nested", "test0.ftl"),
+            os.path.join(self.root, "no_newline.ftl"),
+            os.path.join(self.root, "missing.ftl"),
+            TEST_FILE,
+        ]
+        sub_root = os.path.join(self.root, "sub")
+        with redirect_stderr(io.StringIO()) as stderr:
+            mapping = linter.map_files_to_roots(files, [self.root, sub_root])
+        # Ignored files are reported
+        self.assertEqual(
+            stderr.getvalue().splitlines(),
+            [
+                f"Ignoring {files[3]}: file not found",
+                f"Ignoring {TEST_FILE}: not in any root folder",
+            ],
+        )
+        self.assertEqual(
+            mapping,
+            {
+                self.root: [os.path.join(self.root, "no_newline.ftl")],
+                sub_root: [
+                    os.path.join(sub_root, "nested", "test0.ftl"),
+                    os.path.join(sub_root, "test1.ftl"),
+                ],
+            },
+        )
+
+        # Only the provided files are analyzed: the file without a new line,
+        # and two copies of the test file.
+        with redirect_stderr(io.StringIO()):
+            results = self.lint([self.root, *files], self.config, jobs=1)
+        test_file_results = self.lint([TEST_FILE], self.config, jobs=1)
+        self.assertEqual(len(results), 1 + 2 * len(test_file_results))
+        self.assertEqual(results[0].rule, "MI02")
+
+        # Without root folders, files are analyzed from any folder
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(os.path.join(self.root, "sub"))
+        files, _, _ = linter.get_files([files[2], TEST_FILE])
+        self.assertEqual(
+            files,
+            {
+                os.path.dirname(TEST_FILE): [TEST_FILE],
+                self.root: [os.path.join(self.root, "no_newline.ftl")],
+            },
+        )
+
+    def testFilesAfterOptions(self):
+        # pre-commit appends files after the arguments of the hook
+        config_path = os.path.join(self.root, "config.yml")
+        with open(config_path, "w") as f:
+            f.write("TE01:\n    enabled: false\n")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = linter.run(
+                [
+                    self.root,
+                    "--config",
+                    config_path,
+                    os.path.join(self.root, "no_newline.ftl"),
+                ]
+            )
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Files to analyze: 1.", output.getvalue())
+        self.assertIn("File path: no_newline.ftl", output.getvalue())
+
+    def testLintIter(self):
+        path = os.path.join(self.root, "test0.ftl")
+        items = [
+            path,
+            ("memory.ftl", "foo = Foo's"),
+            ("bytes.ftl", b"foo = Foo\r\nbar = Bar...\r\n"),
+        ]
+        results = list(linter.lint_iter(items, {}))
+        self.assertEqual([p for p, _ in results], [path, "memory.ftl", "bytes.ftl"])
+        self.assertEqual(results[0][1], linter.lint_file(path, os.curdir, {})[0])
+        self.assertEqual([e.rule for e in results[1][1]], ["MI02", "TE01"])
+        self.assertEqual([(e.rule, e.line) for e in results[2][1]], [("TE05", 2)])
+
+        # Errors on the last line, without a new line at the end
+        ((_, errors),) = linter.lint_iter([("last.ftl", "foo = Foo\nbar = Bar's")], {})
+        self.assertEqual(
+            [(e.rule, e.line) for e in errors], [("MI02", None), ("TE01", 2)]
+        )
+
+        # A compiled configuration, parallel jobs and lazy iterables
+        plan = linter.compile_config({})
+        self.assertEqual(list(linter.lint_iter(iter(items), plan, jobs=2)), results)
+
+        # Stop early, without consuming all files
+        consumed = []
+
+        def generate():
+            for i in range(100):
+                consumed.append(i)
+                yield (f"file{i}.ftl", "foo = Foo\n")
+
+        for jobs in (1, 2):
+            consumed.clear()
+            results = linter.lint_iter(generate(), plan, jobs=jobs)
+            self.assertEqual(next(results), ("file0.ftl", []))
+            results.close()
+            self.assertLessEqual(len(consumed), 2 * jobs)
+
+    def testLintBatch(self):
+        config = {"ID01": {"enabled": True}, "MI03": {"enabled": True}}
+        snippets = [
+            ("first", "foo = Foo's\n"),
+            ("second", b"foo = Foo\r\nBar = Bar"),
+            ("third", "foo = Foo\n"),
+        ]
+        results = linter.lint_batch(snippets, config)
+        self.assertEqual([name for name, _ in results], ["first", "second", "third"])
+        self.assertEqual([e.rule for e in results[0][1]], ["TE01"])
+        self.assertEqual(
+            [(e.rule, e.message_id, e.line) for e in results[1][1]],
+            [("MI02", None, None), ("ID01", "Bar", 2)],
+        )
+        # Snippets are not checked against each other
+        self.assertEqual(results[2][1], [])
+
+        plan = linter.compile_config(config)
+        self.assertEqual(linter.lint_batch(snippets, plan), results)
+
+        # The default configuration is only loaded once
+        linter.get_default_plan()
+        with mock.patch.object(linter, "load_config") as load_config:
+            results = linter.lint_batch(snippets)
+            linter.lint_batch(snippets)
+        load_config.assert_not_called()
+        self.assertEqual([e.rule for e in results[0][1]], ["TE01"])
+
+    def testReadContents(self):
+        path = os.path.join(self.root, "newlines.ftl")
+        with open(path, "wb") as f:
+            f.write("foo = Fo\u00f2\r\nbar = Bar\rbaz = Baz\r".encode("utf-8"))
+        expected = "foo = Fo\u00f2\nbar = Bar\nbaz = Baz\n"
+        self.assertEqual(linter.read_contents(path), expected)
+
+        # Large files are mapped in memory
+        with mock.patch.object(linter, "MMAP_THRESHOLD", 10):
+            self.assertEqual(linter.read_contents(path), expected)
+
+        # Files ending with a new line, other whitespace, or empty are accepted
+        for contents, missing in [
+            ("", False),
+            ("foo = Foo", True),
+            ("foo = Foo\n", False),
+            ("foo = Foo\n  ", False),
+            ("foo = Fo\u00f2", True),
+        ]:
+            self.assertEqual(linter.missing_final_newline(contents), missing)
+
+    def testLineOffsets(self):
+        content = "foo = Foo\n\nBar = Bar"
+        self.assertEqual(list(linter.get_line_offsets(content)), [9, 10])
+
+        ftl_linter = linter.Linter("path", "root", {}, content)
+        ftl_linter.visit(linter.parse("foo = Foo\n"))
+        # Positions are only computed when needed
+        self.assertIsNone(ftl_linter._line_offsets)
+        self.assertEqual(ftl_linter.span_to_line_and_col(linter.ast.Span(0, 1)), (1, 1))
+        self.assertEqual(
+            ftl_linter.span_to_line_and_col(linter.ast.Span(11, 12)), (1, 3)
+        )
+        self.assertEqual(
+            ftl_linter.span_to_line_and_col(linter.ast.Span(13, 14)), (3, 3)
+        )
+        self.assertEqual(ftl_linter.line_offsets, linter.get_line_offsets(content))
+
+        # Offsets and lines are still accepted
+        offsets_and_lines = linter.get_offsets_and_lines(content)
+        self.assertEqual(offsets_and_lines, [(9, 1), (10, 2)])
+        ftl_linter = linter.Linter("path", "root", {}, content, offsets_and_lines)
+        self.assertEqual(
+            ftl_linter.span_to_line_and_col(linter.ast.Span(13, 14)), (3, 3)
+        )
+
+    def testReadFileList(self):
+        list_path = os.path.join(self.root, "files.txt")
+        with open(list_path, "w") as f:
+            f.write("a.ftl\nb c.ftl\n\n")
+        self.assertEqual(linter.read_file_list(list_path), ["a.ftl", "b c.ftl"])
+
+        with open(list_path, "w") as f:
+            f.write("a.ftl\0b\nc.ftl\0")
+        self.assertEqual(
+            linter.read_file_list(list_path, null_separated=True),
+            ["a.ftl", "b\nc.ftl"],
+        )
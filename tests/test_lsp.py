@@ -0,0 +1,185 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.fluent_linter import lsp
+
+
+def encode(*messages):
+    data = b""
+    for message in messages:
+        # Raw bytes are sent as they are, e.g. for invalid messages
+        body = message if isinstance(message, bytes) else json.dumps(message).encode()
+        data += b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+    return data
+
+
+def decode(data):
+    stream = io.BytesIO(data)
+    messages = []
+    while True:
+        message = lsp.read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+class TestLSP(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.config = os.path.join(self.root, "config.yml")
+        with open(self.config, "w") as f:
+            f.write("ID01:\n    enabled: true\n")
+        self.uri = "file://" + os.path.join(self.root, "test%20file.ftl")
+
+    def run_server(self, *messages, encodings=None, config=None):
+        initialize = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "rootUri": "file://" + self.root,
+                "initializationOptions": {"config": config or self.config},
+                "capabilities": {"general": {"positionEncodings": encodings or []}},
+            },
+        }
+        shutdown = {"jsonrpc": "2.0", "id": 2, "method": "shutdown"}
+        exit = {"jsonrpc": "2.0", "method": "exit"}
+        output = io.BytesIO()
+        server = lsp.LanguageServer(
+            io.BytesIO(encode(initialize, *messages, shutdown, exit)), output
+        )
+        self.assertEqual(server.run(), 0)
+
+        return decode(output.getvalue())
+
+    def open(self, text):
+        return {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {
+                "textDocument": {
+                    "uri": self.uri,
+                    "languageId": "fluent",
+                    "version": 1,
+                    "text": text,
+                }
+            },
+        }
+
+    def testDiagnostics(self):
+        change = {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": self.uri, "version": 2},
+                "contentChanges": [{"text": "foo = Foo\n"}],
+            },
+        }
+        close = {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didClose",
+            "params": {"textDocument": {"uri": self.uri}},
+        }
+        messages = self.run_server(
+            self.open("# Comment\n\nfoo = 😀 Foo's\n  .attr = Test\nBar = Bar"),
+            change,
+            close,
+        )
+        self.assertEqual(messages[0]["id"], 1)
+        self.assertEqual(
+            messages[0]["result"]["capabilities"]["positionEncoding"], "utf-16"
+        )
+
+        published = messages[1]["params"]
+        self.assertEqual(published["uri"], self.uri)
+        self.assertEqual(published["version"], 1)
+        diagnostics = {d["code"]: d for d in published["diagnostics"]}
+        self.assertEqual(sorted(diagnostics), ["ID01", "MI02", "TE01"])
+        # The range of errors on messages stops at the end of the first line,
+        # and columns are counted in UTF-16 code units.
+        self.assertEqual(
+            diagnostics["TE01"]["range"],
+            {
+                "start": {"line": 2, "character": 0},
+                "end": {"line": 2, "character": 14},
+            },
+        )
+        self.assertEqual(
+            diagnostics["MI02"]["range"]["start"], {"line": 4, "character": 9}
+        )
+
+        # Errors are resolved after the change, and cleared when closing
+        self.assertEqual(messages[2]["params"]["diagnostics"], [])
+        self.assertEqual(messages[2]["params"]["version"], 2)
+        self.assertEqual(messages[3]["params"], {"uri": self.uri, "diagnostics": []})
+        self.assertEqual(messages[4], {"jsonrpc": "2.0", "id": 2, "result": None})
+
+    def testPositionEncoding(self):
+        messages = self.run_server(self.open("foo = 😀 Foo's\n"), encodings=["utf-32"])
+        self.assertEqual(
+            messages[0]["result"]["capabilities"]["positionEncoding"], "utf-32"
+        )
+        (diagnostic,) = messages[1]["params"]["diagnostics"]
+        self.assertEqual(diagnostic["range"]["end"], {"line": 0, "character": 13})
+
+    def testMissingConfig(self):
+        missing = os.path.join(self.root, "missing.yml")
+        messages = self.run_server(self.open("foo = Foo's\n"), config=missing)
+        # The warning is sent as a log message
+        self.assertEqual(
+            [m["method"] for m in messages[1:3]],
+            ["textDocument/publishDiagnostics", "window/logMessage"],
+        )
+        self.assertEqual(len(messages[1]["params"]["diagnostics"]), 1)
+        self.assertEqual(
+            messages[2]["params"]["message"], f"Configuration file not found: {missing}"
+        )
+
+    def testInvalidMessages(self):
+        messages = self.run_server(
+            # Notification without textDocument
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": {}},
+            # Request with invalid parameters
+            {
+                "jsonrpc": "2.0",
+                "id": 5,
+                "method": "initialize",
+                "params": {"capabilities": []},
+            },
+            self.open("foo = Foo's\n"),
+        )
+        self.assertEqual(messages[1]["method"], "window/logMessage")
+        self.assertIn("KeyError", messages[1]["params"]["message"])
+        self.assertEqual(messages[3]["id"], 5)
+        self.assertEqual(messages[3]["error"]["code"], -32603)
+        # The server keeps handling messages
+        self.assertEqual(messages[4]["method"], "textDocument/publishDiagnostics")
+
+    def testParseErrors(self):
+        messages = self.run_server(b"{not json", b"[1, 2]", self.open("foo = Foo's\n"))
+        self.assertEqual(messages[1]["error"]["code"], -32700)
+        self.assertIsNone(messages[1]["id"])
+        self.assertEqual(messages[2]["error"]["code"], -32600)
+        self.assertEqual(messages[3]["method"], "textDocument/publishDiagnostics")
+
+        # Missing header
+        reader = io.BytesIO(b"Content-Type: json\r\n\r\n")
+        with self.assertRaisesRegex(ValueError, "Content-Length"):
+            lsp.read_message(reader)
+
+    def testUriToPath(self):
+        self.assertEqual(
+            lsp.uri_to_path("file:///tmp/100%25%20done.ftl"), "/tmp/100% done.ftl"
+        )
+        self.assertIsNone(lsp.uri_to_path("untitled:Untitled-1"))
+
+    def testUnknownMethod(self):
+        messages = self.run_server({"jsonrpc": "2.0", "id": 5, "method": "unknown"})
+        self.assertEqual(messages[1]["id"], 5)
+        self.assertEqual(messages[1]["error"]["code"], -32601)
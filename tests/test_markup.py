@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from src.fluent_linter import linter
+
+
+class TestMarkup(unittest.TestCase):
+    def assertSameOutput(self, text):
+        self.assertEqual(
+            linter.strip_markup(text), linter.strip_markup_slow(text), repr(text)
+        )
+
+    def testStripMarkup(self):
+        samples = [
+            "",
+            "Plain text",
+            "Text with <b>markup</b>",
+            "<b>Markup</b> only",
+            'Test with <a href="{ $link }" rel="test">link</a>',
+            "Line break<br/>and <img src=x>image",
+            "Entities &amp; references &#39;<b>test</b>",
+            "Trailing entity &amp;",
+            "Incomplete &amp",
+            "a < b > c",
+            "Unclosed <b",
+            "<!-- comment --> text",
+            "<script>var a = '<b>';</script>",
+            "<title>Title</title>",
+            "<B>Upper</B> case",
+            "</ b> space",
+            "<?xml version='1.0'?> text",
+        ]
+        for text in samples:
+            self.assertSameOutput(text)
+
+        self.assertEqual(
+            linter.strip_markup("Text with <b>markup</b>"), "Text with  markup"
+        )
+        self.assertEqual(linter.strip_markup("Plain text"), "Plain text")
+
+    def testRandomMarkup(self):
+        fragments = [
+            "a",
+            " ",
+            "<",
+            ">",
+            "/",
+            '"',
+            "'",
+            "=",
+            "&",
+            "amp;",
+            "#39;",
+            "<b>",
+            "</b>",
+            '<a href="{ $x }">',
+            "</a>",
+            "<br/>",
+            "<script>",
+            "<!--",
+            "\n",
+            "<img src=x>",
+            "{ $var }",
+        ]
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 10)))
+            self.assertSameOutput(text)
@@ -0,0 +1,92 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.fluent_linter import linter
+from src.fluent_linter.profiling import Profiler
+
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_files", "test_linter.ftl")
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        for i in range(3):
+            shutil.copy(TEST_FILE, os.path.join(self.root, f"test{i}.ftl"))
+
+    def testProfiler(self):
+        paths = [os.path.join(self.root, f"test{i}.ftl") for i in range(3)]
+        profiler = Profiler()
+        profiled = list(linter.lint_iter(paths, jobs=4, profiler=profiler))
+
+        # Results are the same as without profiling
+        self.assertEqual(profiled, list(linter.lint_iter(paths)))
+
+        report = profiler.report()
+        self.assertEqual(report["totals"]["files"], 3)
+        self.assertEqual(
+            report["totals"]["errors"], sum(len(errors) for _, errors in profiled)
+        )
+        with open(TEST_FILE, "rb") as f:
+            size = len(f.read())
+        for file_stats in report["files"]:
+            self.assertEqual(file_stats["bytes"], size)
+            self.assertGreater(file_stats["io_seconds"], 0)
+            self.assertGreater(file_stats["parse_seconds"], 0)
+            self.assertGreater(file_stats["visit_seconds"], 0)
+            self.assertGreater(file_stats["nodes"], 0)
+
+        methods = report["methods"]
+        self.assertEqual(methods["check_typography"]["group"], "typography")
+        self.assertGreater(methods["check_typography"]["bytes"], 0)
+        self.assertEqual(
+            methods["visit_Message"]["calls"], methods["check_typography"]["calls"]
+        )
+        self.assertEqual(methods["visit_Identifier"]["group"], "identifiers")
+        self.assertEqual(methods["generic_visit"]["group"], "traversal")
+
+        # Each node is counted once, in the method handling it
+        visits = sum(
+            stats["calls"]
+            for name, stats in methods.items()
+            if name.startswith("visit_") or name == "generic_visit"
+        )
+        self.assertEqual(visits, report["totals"]["nodes"])
+
+        # Exclusive times add up to the visit time
+        seconds = sum(stats["seconds"] for stats in report["groups"].values())
+        self.assertLessEqual(seconds, report["totals"]["visit_seconds"])
+
+    def testAcrossFiles(self):
+        profiler = Profiler()
+        config = {"MI03": {"enabled": True}}
+        list(linter.lint_iter([TEST_FILE], config, profiler=profiler))
+        self.assertEqual(profiler.report()["groups"]["across_files"]["calls"], 1)
+
+    def testCommandLine(self):
+        output = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(output):
+            linter.run([self.root, "--profile"])
+        table = output.getvalue()
+        self.assertIn("typography", table)
+        self.assertIn("visit_Message", table)
+        self.assertIn(os.path.relpath(os.path.join(self.root, "test0.ftl")), table)
+
+        report_path = os.path.join(self.root, "profile.json")
+        with redirect_stdout(io.StringIO()):
+            linter.run([self.root, "--profile", report_path, "-j", "2"])
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report["totals"]["files"], 3)
+        self.assertEqual(
+            sorted(f["path"] for f in report["files"]),
+            [os.path.join(self.root, f"test{i}.ftl") for i in range(3)],
+        )
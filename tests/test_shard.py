@@ -0,0 +1,127 @@
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.fluent_linter import linter, merge
+
+
+class TestShard(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        rng = random.Random(0)
+        os.makedirs(os.path.join(self.root, "sub"))
+        for i in range(20):
+            folder = "sub" if i % 2 else ""
+            with open(os.path.join(self.root, folder, f"file{i}.ftl"), "w") as f:
+                for j in range(rng.randint(1, 30)):
+                    f.write(f"message-{j} = Message {j}'s content\n")
+                if i % 5 == 0:
+                    f.write("missing-newline = Content")
+
+    def testGetShard(self):
+        files, _, _ = linter.get_files([self.root])
+        all_paths = files[self.root]
+
+        shards = [linter.get_shard(files, (i, 3)) for i in range(1, 4)]
+        paths = [shard[self.root] for shard in shards]
+        # Shards don't overlap, include all files, and keep them sorted
+        self.assertEqual(sorted(sum(paths, [])), sorted(all_paths))
+        for shard_paths in paths:
+            self.assertEqual(shard_paths, [p for p in all_paths if p in shard_paths])
+
+        # The split is balanced by size: the difference between shards is
+        # never larger than the largest file.
+        sizes = [sum(map(os.path.getsize, shard_paths)) for shard_paths in paths]
+        largest = max(map(os.path.getsize, all_paths))
+        self.assertLessEqual(max(sizes) - min(sizes), largest)
+
+        # Splitting again returns the same shards
+        self.assertEqual(linter.get_shard(files, (2, 3)), shards[1])
+
+        # More shards than files
+        shards = [linter.get_shard(files, (i, 30)) for i in range(1, 31)]
+        self.assertEqual(sum(len(s[self.root]) for s in shards), 20)
+
+    def testShardType(self):
+        self.assertEqual(linter.shard_type("2/4"), (2, 4))
+        for value in ["0/4", "5/4", "1", "a/b", "1/2/3"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                linter.shard_type(value)
+
+    def testMerge(self):
+        def run(*argv):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                exit_code = linter.run([self.root, "--format", "jsonl", *argv])
+            return exit_code, output.getvalue()
+
+        exit_code, full = run()
+        self.assertEqual(exit_code, 1)
+
+        shard_files = []
+        for i in range(1, 4):
+            _, output = run("--shard", f"{i}/3")
+            shard_files.append(os.path.join(self.root, f"shard{i}.jsonl"))
+            with open(shard_files[-1], "w") as f:
+                f.write(output)
+            # Results end with a record about the shard
+            record = json.loads(output.splitlines()[-1])
+            self.assertEqual(record["shard"], f"{i}/3")
+            self.assertTrue(record["complete"])
+            self.assertGreater(record["files"], 0)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = merge.run([*shard_files, "--format", "jsonl"])
+        self.assertEqual(exit_code, 1)
+        merged = [json.loads(line) for line in output.getvalue().splitlines()]
+        full = [json.loads(line) for line in full.splitlines()]
+        self.assertEqual(
+            sorted(merged, key=lambda e: (e["path"], e["line"] or 0)),
+            sorted(full, key=lambda e: (e["path"], e["line"] or 0)),
+        )
+        # Results are grouped by file
+        self.assertEqual([e["path"] for e in merged], sorted(e["path"] for e in merged))
+
+        # Shards without errors
+        empty = os.path.join(self.root, "empty.jsonl")
+        with open(empty, "w") as f:
+            f.write('{"shard": "1/1", "files": 0, "complete": true}\n')
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(merge.run([empty]), 0)
+        self.assertEqual(output.getvalue(), "No errors found.\n")
+
+        # Interrupted shard, without the final record
+        incomplete = os.path.join(self.root, "incomplete.jsonl")
+        with open(shard_files[1]) as f:
+            lines = f.readlines()
+        with open(incomplete, "w") as f:
+            f.writelines(lines[:-1])
+
+        # Invalid, missing, incomplete or repeated results
+        invalid = os.path.join(self.root, "invalid.jsonl")
+        with open(invalid, "w") as f:
+            f.write('{"path": "a.ftl"}\n')
+        for sources, message in [
+            ([invalid], "unexpected result"),
+            ([os.path.join(self.root, "missing.jsonl")], "missing.jsonl"),
+            ([shard_files[0], incomplete, shard_files[2]], "incomplete results"),
+            ([shard_files[0], shard_files[2]], "missing results for shards 2/3"),
+            ([*shard_files, shard_files[1]], "more than once"),
+            ([*shard_files, empty], "different splits"),
+            ([shard_files[0], shard_files[0], shard_files[2]], "shards 2/3"),
+        ]:
+            with redirect_stderr(io.StringIO()) as stderr:
+                self.assertEqual(merge.run(sources), 2)
+            self.assertIn("Error reading results", stderr.getvalue())
+            self.assertIn(message, stderr.getvalue())
@@ -220,3 +220,38 @@ foo = bar...
         results = self.checkContent(config, content)
         self.assertEqual(len(results), 1)
         self.assertTrue("TE05" in results[0])
+
+    def testTextFromSpans(self):
+        content = """
+foo=bar's bar
+multiline =
+  Wrong 'quotes'
+      and "quotes"...
+  .attr = It's Firefox
+placeable = Test {$var} "quotes" with { -brand-short-name } account
+select = { $n ->
+  [one] One "quote"
+ *[other] {$n} quotes...
+}
+-term = Test's
+html = <a href="{ $link }">Firefox's</a>
+"""
+        config = {
+            "CO01": {
+                "enabled": True,
+                "brands": ["Firefox", "{ -brand-short-name } account"],
+            }
+        }
+
+        def check(text_from_spans):
+            ftl_linter = linter.Linter(
+                "path", "root", config, content, linter.get_offsets_and_lines(content)
+            )
+            ftl_linter.text_from_spans = text_from_spans
+            ftl_linter.visit(parse(content))
+
+            return ftl_linter.results
+
+        results = check(True)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results, check(False))
@@ -0,0 +1,127 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from src.fluent_linter import linter, watch
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        os.makedirs(os.path.join(self.root, "sub"))
+        self.path = os.path.join(self.root, "sub", "test.ftl")
+        with open(self.path, "w") as f:
+            f.write("foo = Foo's\nbar = Bar\n")
+
+    def lint(self, lint_watch):
+        with redirect_stdout(io.StringIO()):
+            return lint_watch.lint()
+
+    def testDiffResults(self):
+        def error(msg, line=1):
+            return linter.LintError("test.ftl", "foo", "TE01", line, 1, msg)
+
+        added, resolved = watch.diff_results(
+            [error("a"), error("b"), error("b")],
+            [error("b", line=5), error("c"), error("c")],
+        )
+        self.assertEqual(added, [error("c"), error("c")])
+        self.assertEqual(resolved, [error("a"), error("b")])
+
+    def testLintWatch(self):
+        lint_watch = watch.LintWatch([self.root], None)
+        added, resolved = self.lint(lint_watch)
+        self.assertEqual(len(added), 1)
+        self.assertEqual(added[0].rule, "TE01")
+        self.assertEqual(resolved, [])
+
+        # No changes
+        self.assertEqual(self.lint(lint_watch), ([], []))
+
+        with open(self.path, "w") as f:
+            f.write("foo = Foo’s\nbar = Bar...\n")
+        added, resolved = self.lint(lint_watch)
+        self.assertEqual(len(added), 1)
+        self.assertEqual(added[0].rule, "TE05")
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(resolved[0].rule, "TE01")
+
+        self.assertEqual(
+            lint_watch.get_folders(), [self.root, os.path.join(self.root, "sub")]
+        )
+
+    def testUnreadableFile(self):
+        # Broken link, like a file being replaced by an editor
+        os.symlink(
+            os.path.join(self.root, "missing.ftl"), os.path.join(self.root, "a.ftl")
+        )
+        lint_watch = watch.LintWatch([self.root], None)
+        output = io.StringIO()
+        with redirect_stderr(output):
+            added, _ = self.lint(lint_watch)
+        self.assertEqual([e.rule for e in added], ["TE01"])
+        self.assertIn("a.ftl: file not readable", output.getvalue())
+
+    def testErrors(self):
+        class Watcher:
+            def __init__(self):
+                self.changes = 3
+
+            def watch(self, folders):
+                pass
+
+            def wait(self):
+                self.changes -= 1
+                if not self.changes:
+                    raise KeyboardInterrupt
+                return True
+
+            def close(self):
+                pass
+
+        errors = [OSError(2, "No such file or directory"), None]
+        lint = watch.LintWatch.lint
+
+        def failing_lint(lint_watch):
+            if lint_watch.results:
+                error = errors.pop(0)
+                if error is not None:
+                    raise error
+                with open(self.path, "w") as f:
+                    f.write("foo = Foo\n")
+            return lint(lint_watch)
+
+        output = io.StringIO()
+        with (
+            mock.patch.object(watch, "get_watcher", return_value=Watcher()),
+            mock.patch.object(watch.LintWatch, "lint", failing_lint),
+            redirect_stdout(io.StringIO()),
+            redirect_stderr(output),
+        ):
+            exit_code = watch.watch([self.root], None)
+
+        # The watch continued after the error, and saw the fix
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(errors, [])
+        self.assertIn("No such file or directory", output.getvalue())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify requires Linux")
+    def testInotifyWatcher(self):
+        watcher = watch.get_watcher()
+        self.addCleanup(watcher.close)
+        self.assertIsInstance(watcher, watch.InotifyWatcher)
+
+        watcher.watch([os.path.join(self.root, "sub")])
+        self.assertFalse(watcher.wait(timeout=0))
+        with open(self.path, "a") as f:
+            f.write("baz = Baz\n")
+        self.assertTrue(watcher.wait(timeout=1, settle=0))
+        self.assertFalse(watcher.wait(timeout=0))